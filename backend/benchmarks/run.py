@@ -0,0 +1,461 @@
+"""Offline benchmark of the strategy evaluation pipeline.
+
+Times every stage a generation goes through, against the stub LLM and the
+repo's strategies under `strategies/` (plus the stub's own strategy, the
+only one with a vectorized `signals()`, which the vector engine runs):
+
+    setup        copy_data, image_build, container_start, data_prepare
+                 (the phases of runner.start(); Docker-only ones are absent
+                 on the local backend)
+    per case     upload, compile, backtest_<engine>, download, aggregate,
+                 generation (implement + aggregate end to end)
+
+Cases cross the number of concurrent strategies (1, 4, 16) with the dataset
+(the ~13k-bar QQQ history, or a synthetic 1M-bar series). Per-strategy
+stages report the stage's wall time and the p50/max of single items.
+`--max-backtests` caps how many backtests run at once, for machines without
+the memory for 16 concurrent 1M-bar runs; each case records the cap it ran
+with.
+
+Results are written as JSON and compared to a stored baseline; a stage more
+than `--tolerance` slower (and at least `--min-delta` seconds) is flagged as
+a regression. Run from `backend/`:
+
+    python -m benchmarks.run --backend local --concurrency 1 4 --datasets 13k
+    python -m benchmarks.run --update-baseline
+"""
+
+import argparse
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.agent.nodes.aggregate import aggregate
+from src.agent.nodes.artifacts import get_artifact_store, summarize_result
+from src.agent.nodes.container import LocalSandboxRunner, PersistentDockerRunner
+from src.agent.nodes.container.validate import validate_strategy
+from src.agent.nodes.implement import implement
+from src.agent.nodes.resources import register
+from src.agent.other.configuration import Configuration
+from src.agent.other.stub_llm import STUB_STRATEGY_CODE, StubAnthropic
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, "..", "src", "agent", "nodes", "container", "data")
+STRATEGY_DIR = os.path.join(HERE, "..", "..", "strategies")
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+RESULTS_PATH = os.path.join(HERE, "results", "latest.json")
+
+# Dataset name -> (symbol, synthetic bar count or None for the real data)
+DATASETS = {"13k": ("QQQ", None), "1m": ("SYNTH", 1_000_000)}
+SETUP_PHASES = ("copy_data", "image_build", "container_start", "data_prepare")
+
+
+def synthetic_bars(symbol: str, bars: int, seed: int = 0) -> pd.DataFrame:
+    """A geometric random walk of 15-minute OHLCV bars, in data.csv layout."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, bars))
+    return pd.DataFrame(
+        {
+            "Datetime": pd.date_range("2000-01-03 09:30", periods=bars, freq="15min"),
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + spread),
+            "Low": np.minimum(open_, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, bars),
+            "StockName": symbol,
+        }
+    )
+
+
+def make_data_dir(datasets) -> str:
+    """Copy of the harness data with the synthetic datasets appended."""
+    data_dir = os.path.join(tempfile.mkdtemp(), "data")
+    shutil.copytree(
+        DATA_DIR, data_dir, ignore=shutil.ignore_patterns("__pycache__", ".cache")
+    )
+    for name in datasets:
+        symbol, bars = DATASETS[name]
+        if bars:
+            synthetic_bars(symbol, bars).to_csv(
+                os.path.join(data_dir, "data.csv"),
+                mode="a",
+                header=False,
+                index=False,
+                float_format="%.4f",
+                date_format="%Y-%m-%d %H:%M:%S",
+            )
+    return data_dir
+
+
+def load_strategies(strategy_dir: str):
+    """(name, code) of every valid strategy file, then the stub strategy."""
+    strategies = []
+    for filename in sorted(os.listdir(strategy_dir)):
+        if not filename.endswith(".py"):
+            continue
+        with open(os.path.join(strategy_dir, filename)) as f:
+            code = f.read()
+        if not validate_strategy(code, filename):
+            strategies.append((os.path.splitext(filename)[0], code))
+    return strategies + [("stub", STUB_STRATEGY_CODE)]
+
+
+def supports(engine: str, code: str) -> bool:
+    """Whether a strategy can run on `engine`; the vector engine needs
+    `signals()`."""
+    return engine != "vector" or "def signals(" in code
+
+
+def run_stage(fn, items, concurrency: int):
+    """Run `fn` on every item with `concurrency` threads and time it."""
+    durations, errors = [], []
+
+    def timed(item):
+        started = time.perf_counter()
+        try:
+            fn(item)
+        except Exception as e:
+            errors.append(str(e).strip().splitlines()[-1] if str(e).strip() else e)
+        finally:
+            durations.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, items))
+    stage = {
+        "wall": time.perf_counter() - started,
+        "p50": statistics.median(durations),
+        "max": max(durations),
+        "errors": len(errors),
+    }
+    if errors:
+        stage["error"] = str(errors[0])
+    return stage
+
+
+def timed_call(fn):
+    started = time.perf_counter()
+    fn()
+    return {"wall": time.perf_counter() - started}
+
+
+def run_case(
+    runner, strategies, concurrency: int, dataset: str, engines, max_backtests=None
+):
+    symbol, _ = DATASETS[dataset]
+    case = f"c{concurrency}-{dataset}"
+    backtests = min(concurrency, max_backtests or concurrency)
+
+    def cycle(candidates):
+        return [
+            (f"bench-{case}-{index}-{source}", code)
+            for index, (source, code) in zip(
+                range(concurrency), itertools.cycle(candidates)
+            )
+        ]
+
+    # Every engine runs `concurrency` strategies, cycling through the ones
+    # it supports; uploads cover all of them once
+    items = cycle(strategies)
+    engine_items = {
+        engine: cycle([s for s in strategies if supports(engine, s[1])])
+        for engine in engines
+    }
+    uploads = list(dict.fromkeys(itertools.chain(items, *engine_items.values())))
+    results, series_paths = {}, {}
+    stages = {}
+
+    def upload(item):
+        name, code = item
+        runner.upload_file(code, f"strategies/{name}.py")
+
+    def compile_(item):
+        name, code = item
+        problems = validate_strategy(code, f"{name}.py")
+        if problems:
+            raise ValueError("; ".join(problems))
+
+    # Under a memory budget, as in a generation: each backtest runs in a
+    # forked child, so the eval server gives its memory back afterwards
+    max_rss_mb = Configuration().eval_max_rss_mb
+
+    def backtest(engine):
+        def run(item):
+            name, _ = item
+            response = runner.evaluate(
+                f"strategies/{name}.py",
+                engine=engine,
+                symbol=symbol,
+                series_path=f"logs/{name}-{engine}.npz",
+                max_rss_mb=max_rss_mb,
+            )
+            if response.get("status") != "ok":
+                raise RuntimeError(response.get("error", response.get("status")))
+            results.setdefault(name, response["metrics"])
+            series_paths.setdefault(name, f"logs/{name}-{engine}.npz")
+
+        return run
+
+    def download(item):
+        name, _ = item
+        if name not in series_paths:
+            raise FileNotFoundError(f"No series for {name}")
+        with np.load(io.BytesIO(runner.download_bytes(series_paths[name]))) as series:
+            [series[key] for key in series.files]
+
+    stages["upload"] = run_stage(upload, uploads, concurrency)
+    stages["compile"] = run_stage(compile_, uploads, concurrency)
+    for engine in engines:
+        stages[f"backtest_{engine}"] = run_stage(
+            backtest(engine), engine_items[engine], backtests
+        )
+    evaluated = [item for item in uploads if item[0] in series_paths]
+    stages["download"] = run_stage(download, evaluated, concurrency)
+
+    # No result cache: every strategy of the case is really evaluated. No
+    # time budgets either; large cases on few CPUs would otherwise time out
+    config = {
+        "configurable": {
+            "result_cache_max_mb": 0,
+            "eval_timeout": 0,
+            "eval_cpu_seconds": 0,
+            "artifact_dir": tempfile.mkdtemp(),
+        }
+    }
+    artifacts = get_artifact_store(config["configurable"]["artifact_dir"])
+    solutions = [
+        {
+            "solution_id": f"1_{index + 1}",
+            "description": name,
+            "code_id": artifacts.put_text(code),
+            "result_id": artifacts.put_json(results.get(name, {})),
+            "result": summarize_result(results.get(name, {})),
+            "pre_result": {},
+        }
+        for index, (name, code) in enumerate(items)
+    ]
+    stages["aggregate"] = timed_call(
+        lambda: aggregate({"think_count": 1, "solutions": [solutions]}, config)
+    )
+
+    def generation():
+        # The registry entry lives as long as the benchmark; releasing it
+        # would stop the shared runner
+        run_id = f"benchmark-{case}"
+        register(run_id, runner=runner, client=StubAnthropic(latency=0))
+        state = {
+            "stock_symbol": symbol,
+            "run_id": run_id,
+            "timestamp": case,
+            "think_count": 1,
+            "solutions": [
+                [
+                    {
+                        "solution_id": f"1_{index + 1}",
+                        "description": name,
+                        "pre_description": "",
+                        "code_id": None,
+                        "pre_code_id": None,
+                        "result_id": None,
+                        "pre_result_id": None,
+                        "result": {},
+                        "pre_result": {},
+                        "improvement": "",
+                    }
+                    for index, (name, _) in enumerate(items)
+                ]
+            ],
+        }
+        state = {**state, **implement(state, config)}
+        aggregate(state, config)
+
+    stages["generation"] = timed_call(generation)
+    return case, {
+        "concurrency": concurrency,
+        "backtest_concurrency": backtests,
+        "dataset": dataset,
+        "symbol": symbol,
+        "stages": stages,
+    }
+
+
+def flatten(document):
+    """{"setup/<phase>" | "<case>/<stage>": wall seconds} of a results file."""
+    flat = {
+        f"setup/{phase}": seconds
+        for phase, seconds in document.get("setup", {}).items()
+        if seconds is not None
+    }
+    for case, result in document.get("cases", {}).items():
+        for stage, timing in result["stages"].items():
+            flat[f"{case}/{stage}"] = timing["wall"]
+    return flat
+
+
+def compare(document, baseline, tolerance: float, min_delta: float):
+    """Per-stage ratio to the baseline; stages missing from either are skipped."""
+    current, before = flatten(document), flatten(baseline)
+    comparison = {}
+    for key in sorted(current.keys() & before.keys()):
+        ratio = current[key] / before[key] if before[key] else None
+        comparison[key] = {
+            "baseline": before[key],
+            "current": current[key],
+            "ratio": ratio,
+            "regression": current[key] > before[key] * (1 + tolerance)
+            and current[key] - before[key] > min_delta,
+        }
+    return comparison
+
+
+def format_report(document) -> str:
+    lines = [f"{'stage':<32} {'wall s':>9} {'base s':>9} {'ratio':>7}"]
+    comparison = document.get("comparison", {})
+    for key, seconds in flatten(document).items():
+        row = comparison.get(key)
+        if row:
+            flag = "  ❌ regression" if row["regression"] else ""
+            ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+            lines.append(
+                f"{key:<32} {seconds:>9.3f} {row['baseline']:>9.3f} {ratio:>7}{flag}"
+            )
+        else:
+            lines.append(f"{key:<32} {seconds:>9.3f} {'-':>9} {'-':>7}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=("local", "docker"), default="local")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16], metavar="N"
+    )
+    parser.add_argument(
+        "--datasets", nargs="+", choices=sorted(DATASETS), default=["13k", "1m"]
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=("backtrader", "vector"),
+        default=["backtrader", "vector"],
+    )
+    parser.add_argument("--strategy-dir", default=STRATEGY_DIR)
+    parser.add_argument(
+        "--max-backtests",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Run at most N backtests at once (default: the case's concurrency)",
+    )
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Slowdown ratio above which a stage counts as a regression",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.05,
+        help="Ignore slowdowns smaller than this many seconds",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when any stage regressed",
+    )
+    args = parser.parse_args(argv)
+
+    data_dir = make_data_dir(args.datasets)
+    strategies = load_strategies(args.strategy_dir)
+    if args.backend == "local":
+        runner = LocalSandboxRunner(data_dir)
+    else:
+        runner = PersistentDockerRunner(data_dir)
+
+    document = {
+        "meta": {
+            "backend": args.backend,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": (
+                len(os.sched_getaffinity(0))
+                if hasattr(os, "sched_getaffinity")
+                else os.cpu_count()
+            ),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "strategies": [name for name, _ in strategies],
+            "engines": args.engines,
+            "max_backtests": args.max_backtests,
+        },
+        "cases": {},
+    }
+    try:
+        runner.start()
+        document["setup"] = {phase: runner.timings.get(phase) for phase in SETUP_PHASES}
+        for dataset in args.datasets:
+            for concurrency in args.concurrency:
+                case, result = run_case(
+                    runner,
+                    strategies,
+                    concurrency,
+                    dataset,
+                    args.engines,
+                    args.max_backtests,
+                )
+                document["cases"][case] = result
+                print(f"✅ [Benchmark] {case} done")
+    finally:
+        runner.stop()
+        shutil.rmtree(os.path.dirname(data_dir), ignore_errors=True)
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        document["comparison"] = compare(
+            document, baseline, args.tolerance, args.min_delta
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"✅ [Benchmark] Baseline updated: {args.baseline}")
+
+    print(format_report(document))
+    print(f"Results: {args.output}")
+
+    regressions = [
+        key for key, row in document.get("comparison", {}).items() if row["regression"]
+    ]
+    if regressions:
+        print(f"❌ [Benchmark] {len(regressions)} stage(s) regressed")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,31 @@
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
-from src.agent.nodes import GraphState, initialize, think, implement, aggregate, finish
+from src.agent.nodes import (
+    GraphState,
+    initialize,
+    think,
+    implement,
+    stream,
+    aggregate,
+    finish,
+)
+from src.agent.other.configuration import Configuration
+
+
+def route_generation(state: GraphState, config: RunnableConfig) -> str:
+    """Pick the staged (think -> implement) or streaming generation path"""
+    if Configuration.from_runnable_config(config).streaming:
+        return "stream"
+    return "think"
 
 
-def route_after_aggregate(state: GraphState) -> str:
+def route_after_aggregate(state: GraphState, config: RunnableConfig) -> str:
     """Route based on think count and success rate"""
     success_rate = state.get("aggregate_metrics", {}).get("success_rate", 0)
 
     # Continue thinking if we haven't reached max iterations and success rate is low
     if state["think_count"] < 3 and (success_rate < 0.8 or state["think_count"] == 1):
-        return "think"
+        return route_generation(state, config)
     else:
         return "finish"
 
@@ -22,6 +39,7 @@ workflow = StateGraph(GraphState)
 workflow.add_node("initialize", initialize)
 workflow.add_node("think", think)
 workflow.add_node("implement", implement)
+workflow.add_node("stream", stream)
 workflow.add_node("aggregate", aggregate)
 workflow.add_node("finish", finish)
 
@@ -29,15 +47,20 @@ workflow.add_node("finish", finish)
 workflow.set_entry_point("initialize")
 
 # Add edges
-workflow.add_edge("initialize", "think")
+workflow.add_conditional_edges(
+    "initialize",
+    route_generation,
+    {"think": "think", "stream": "stream"},
+)
 workflow.add_edge("think", "implement")
 workflow.add_edge("implement", "aggregate")
+workflow.add_edge("stream", "aggregate")
 
 # Conditional routing after aggregation
 workflow.add_conditional_edges(
     "aggregate",
     route_after_aggregate,
-    {"think": "think", "finish": "finish"},
+    {"think": "think", "stream": "stream", "finish": "finish"},
 )
 
 workflow.add_edge("finish", END)
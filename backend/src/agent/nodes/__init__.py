@@ -2,6 +2,7 @@ from .state import GraphState
 from .initialize import initialize
 from .think import think
 from .implement import implement
+from .stream import stream
 from .aggregate import aggregate
 from .finish import finish
 
@@ -10,6 +11,7 @@ __all__ = [
     "initialize",
     "think",
     "implement",
+    "stream",
     "aggregate",
     "finish",
 ]
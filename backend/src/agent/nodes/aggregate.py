@@ -1,32 +1,64 @@
+from langchain_core.runnables import RunnableConfig
+
+from .artifacts import get_artifact_store
 from .state import GraphState
+from ..other.configuration import Configuration
+
+
+def is_too_slow(result, max_next_p90_ms: float) -> bool:
+    """Whether a profiled result's per-bar next() latency is pathological"""
+    p90 = result.get("profile", {}).get("next", {}).get("p90_ms")
+    return p90 is not None and p90 > max_next_p90_ms
+
+
+def score(result) -> float:
+    """Ranking score of a result: out-of-sample Sharpe ratio for walk-forward
+    evaluations, final portfolio value otherwise"""
+    walk_forward = result.get("walk_forward")
+    if walk_forward:
+        oos_sharpe = walk_forward.get("oos_sharpe")
+        return oos_sharpe if oos_sharpe is not None else float("-inf")
+    return result.get("final_value") or 0
 
 
-def aggregate(state: GraphState) -> GraphState:
+def aggregate(state: GraphState, config: RunnableConfig) -> GraphState:
     """Aggregate all processed solutions and decide next step"""
+    configurable = Configuration.from_runnable_config(config)
     solutions = state["solutions"]
     next_iteration = []
 
     for index, s in enumerate(solutions[-1]):
         solution_id = f'{state["think_count"]+1}_{index+1}'
 
-        if not s.get("result"):
+        # Skip failed strategies, including ones that ran out of time or memory
+        if not s.get("result") or s["result"].get("status", "ok") != "ok":
+            continue
+
+        if is_too_slow(s["result"], configurable.max_next_p90_ms):
+            p90 = s["result"]["profile"]["next"]["p90_ms"]
+            print(
+                f"❌ [Aggregate] strategy-{s['solution_id']}: next() p90 "
+                f"{p90:.2f}ms exceeds {configurable.max_next_p90_ms}ms, dropped"
+            )
             continue
 
         if (
             s["pre_result"].get("final_value")
             and s["result"].get("final_value")
-            and s["pre_result"].get("final_value") < s["result"].get("final_value")
+            and score(s["pre_result"]) < score(s["result"])
         ):
             next_iteration.append(
                 {
                     "solution_id": solution_id,
                     "description": "",
                     "pre_description": s.get("pre_description", ""),
-                    "code": "",
-                    "result": "",
+                    "code_id": None,
+                    "result_id": None,
+                    "result": {},
                     "improvement": "",
-                    "pre_result": s.get("pre_result", ""),
-                    "pre_code": s.get("pre_code", ""),
+                    "pre_result": s.get("pre_result", {}),
+                    "pre_result_id": s.get("pre_result_id"),
+                    "pre_code_id": s.get("pre_code_id"),
                 }
             )
         else:
@@ -35,23 +67,34 @@ def aggregate(state: GraphState) -> GraphState:
                     "solution_id": solution_id,
                     "description": "",
                     "pre_description": s.get("description", ""),
-                    "code": "",
-                    "result": "",
+                    "code_id": None,
+                    "result_id": None,
+                    "result": {},
                     "improvement": "",
-                    "pre_result": s.get("result", ""),
-                    "previous_code": s.get("code", ""),
+                    "pre_result": s.get("result", {}),
+                    "pre_result_id": s.get("result_id"),
+                    "pre_code_id": s.get("code_id"),
                 }
             )
 
     length = max(1, len(solutions[-1]) // 2)
     next_iteration = sorted(
         next_iteration,
-        key=lambda s: s["pre_result"].get("final_value", 0),
+        # Backtests stopped early rank below every complete one
+        key=lambda s: (
+            not s["pre_result"].get("partial"),
+            score(s["pre_result"]),
+        ),
         reverse=True,
     )[:length]
 
-    state["solutions"].append(next_iteration)
-
-    return {
-        **state,
-    }
+    # The finished generation goes to the artifact store; state keeps only
+    # the next one and the head of the history chain
+    history = get_artifact_store(configurable.artifact_dir).put_json(
+        {
+            "generation": state["think_count"],
+            "previous": state.get("history"),
+            "solutions": solutions[-1],
+        }
+    )
+    return {"solutions": [next_iteration], "history": history}
@@ -0,0 +1,139 @@
+"""Content-addressed store of generation artifacts.
+
+Strategy sources, full backtest results with their equity and action
+series (.npz), and finished generations are written once to disk, named
+by the SHA-256 of their content. GraphState keeps only their ids and the
+summary metrics aggregate ranks by, so its size doesn't grow with the
+number of generations; full bodies are loaded when a prompt or a view
+needs them.
+
+Each finished generation is stored as a record pointing at the previous
+one, and `GraphState["history"]` holds the id of the latest:
+
+    {"generation": 2, "previous": "<id>" | None, "solutions": [...]}
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+# Result fields kept in state, as (path, ...) into the metrics dict. The
+# summary has the same nesting as the metrics, so ranking code reads both.
+SUMMARY_PATHS = (
+    ("status",),
+    ("error",),
+    ("final_value",),
+    ("partial",),
+    ("early_stop", "reason"),
+    ("sharpe", "sharperatio"),
+    ("drawdown", "max", "drawdown"),
+    ("walk_forward", "oos_sharpe"),
+    ("profile", "next", "p90_ms"),
+)
+MAX_SUMMARY_ERROR = 500
+
+
+class ArtifactStore:
+    """Immutable blobs under `directory`, sharded by the first two hex
+    digits of their id."""
+
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> str:
+        return os.path.join(self.directory, artifact_id[:2], artifact_id[2:])
+
+    def put(self, data: bytes) -> str:
+        artifact_id = hashlib.sha256(data).hexdigest()
+        path = self._path(artifact_id)
+        if os.path.exists(path):
+            return artifact_id
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return artifact_id
+
+    def get(self, artifact_id: str) -> bytes:
+        with open(self._path(artifact_id), "rb") as f:
+            return f.read()
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode())
+
+    def get_text(self, artifact_id: Optional[str]) -> str:
+        """The stored text, or "" without an id."""
+        return self.get(artifact_id).decode() if artifact_id else ""
+
+    def put_json(self, value: Any) -> str:
+        return self.put(
+            json.dumps(
+                value, sort_keys=True, separators=(",", ":"), default=str
+            ).encode()
+        )
+
+    def get_json(self, artifact_id: Optional[str]) -> Any:
+        """The stored value, or {} without an id."""
+        return json.loads(self.get(artifact_id)) if artifact_id else {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_artifact_store(directory: str) -> ArtifactStore:
+    return ArtifactStore(directory)
+
+
+def get_series(store: ArtifactStore, series_id: str) -> Dict[str, np.ndarray]:
+    """Equity and action series of an evaluation, from its stored .npz
+    (a result's "series_id")."""
+    with np.load(io.BytesIO(store.get(series_id))) as series:
+        return {key: series[key] for key in series.files}
+
+
+def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The SUMMARY_PATHS of a result, in the same nesting."""
+    summary = {}
+    for path in SUMMARY_PATHS:
+        value = result
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is None:
+            continue
+
+        if path == ("error",):
+            value = str(value)[-MAX_SUMMARY_ERROR:]
+        target = summary
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+    return summary
+
+
+def expand_solution(store: ArtifactStore, solution: Dict[str, Any]) -> Dict[str, Any]:
+    """A solution with its full code and results loaded from the store."""
+    return {
+        **solution,
+        "code": store.get_text(solution.get("code_id")),
+        "pre_code": store.get_text(solution.get("pre_code_id")),
+        "result": store.get_json(solution.get("result_id")) or solution.get("result"),
+        "pre_result": store.get_json(solution.get("pre_result_id"))
+        or solution.get("pre_result"),
+    }
+
+
+def iter_history(
+    store: ArtifactStore, history: Optional[str]
+) -> Iterator[Dict[str, Any]]:
+    """Finished generation records, latest first."""
+    while history:
+        record = store.get_json(history)
+        yield record
+        history = record.get("previous")
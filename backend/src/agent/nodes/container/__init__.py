@@ -1,3 +1,13 @@
+from .base import SandboxRunner, load_series
 from .container import PersistentDockerRunner
+from .local import LocalSandboxRunner
+from .pool import BACKENDS, RunnerPool
 
-__all__ = ["PersistentDockerRunner"]
+__all__ = [
+    "BACKENDS",
+    "LocalSandboxRunner",
+    "PersistentDockerRunner",
+    "RunnerPool",
+    "SandboxRunner",
+    "load_series",
+]
@@ -0,0 +1,262 @@
+import hashlib
+import os
+import queue
+import shutil
+import socket
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Extra seconds the host waits past an evaluation's own wall-clock budget
+# before giving up on the server
+EVAL_TIMEOUT_GRACE = 30
+
+
+def load_series(path: str) -> Dict[str, np.ndarray]:
+    """Equity and action series of an evaluation, from its .npz side file."""
+    with np.load(path) as series:
+        return {key: series[key] for key in series.files}
+
+
+class SandboxRunner(ABC):
+    """A sandbox that strategies are uploaded to, run and evaluated in.
+
+    Every backend copies the files under `data_dir` into a fresh `workdir`
+    that the sandbox sees as its working directory (/app in Docker), so
+    paths passed to `upload_file`, `download_file`, `run_command` and
+    `evaluate` are relative to it on every backend. Evaluation servers load
+    `warm_symbols` when they start, and other symbols on first use.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        cpuset_cpus: Optional[str] = None,
+        warm_symbols: Sequence[str] = (),
+    ):
+        self.data_dir = data_dir
+        self.cpuset_cpus = cpuset_cpus
+        self.warm_symbols = list(warm_symbols)
+        self.workdir = tempfile.mkdtemp()
+        self._idle_workers = queue.LifoQueue()
+        self._fingerprint = None
+        # Whether files written to the workdir are visible inside the sandbox
+        self.shared_workspace = True
+        # Seconds spent in each phase of start(), for benchmarks
+        self.timings: Dict[str, float] = {}
+
+    @abstractmethod
+    def start(self):
+        """Prepare the sandbox; it is ready for commands afterwards."""
+
+    @abstractmethod
+    def run_command(self, command: str, timeout: Optional[float] = None) -> str:
+        """Run a command in the sandbox, killed after `timeout` seconds.
+
+        Returns its stdout; anything written to stderr raises.
+        """
+
+    @abstractmethod
+    def _runtime(self) -> str:
+        """Identifies the interpreter and packages evaluations run on."""
+
+    @abstractmethod
+    def _new_worker(self):
+        """Start an evaluation server (see worker.py)."""
+
+    @abstractmethod
+    def _sandbox_files(self) -> List[str]:
+        """Paths of every file in the sandbox, relative to its workdir."""
+
+    def _data_files(self):
+        """Yield (source path, path relative to data/) for every data file."""
+        if not os.path.exists(self.data_dir):
+            return
+        for root, dirs, files in os.walk(self.data_dir):
+            # Skip __pycache__ and local data cache directories
+            dirs[:] = sorted(d for d in dirs if d not in ("__pycache__", ".cache"))
+
+            for file in sorted(files):
+                # Skip .pyc files
+                if file.endswith(".pyc"):
+                    continue
+
+                src_path = os.path.join(root, file)
+                # Preserve the relative path structure from data/ directory
+                yield src_path, os.path.relpath(src_path, self.data_dir)
+
+    def _copy_data(self):
+        # Copy all files from data directory to workdir (preserving directory structure)
+        for src_path, relative_path in self._data_files():
+            dest_path = os.path.join(self.workdir, relative_path)
+
+            # Create destination directory if it doesn't exist
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+            # Copy file with metadata preservation
+            shutil.copy2(src_path, dest_path)
+            print(f"Copied: {src_path} -> {dest_path}")
+
+    def fingerprint(self) -> dict:
+        """Hashes of the market data, of the evaluation harness code and of
+        the runtime it runs on."""
+        if self._fingerprint is None:
+            data, engine = hashlib.sha256(), hashlib.sha256()
+            for src_path, relative_path in self._data_files():
+                if relative_path.startswith("strategies" + os.sep):
+                    continue
+                digest = engine if relative_path.endswith(".py") else data
+                digest.update(relative_path.encode() + b"\0")
+                with open(src_path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+            self._fingerprint = {
+                "data": data.hexdigest()[:16],
+                "engine": engine.hexdigest()[:16],
+                "runtime": self._runtime(),
+            }
+        return self._fingerprint
+
+    @contextmanager
+    def _timed(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = time.perf_counter() - started
+
+    @contextmanager
+    def lease(self):
+        """Same interface as RunnerPool.lease(); a single runner is shared."""
+        yield self
+
+    def _write_local(self, filename: str, data: bytes):
+        """Write a file into the workdir atomically, so the sandbox never
+        reads it half-written"""
+        path = os.path.join(self.workdir, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def upload_files(self, files: Dict[str, Union[str, bytes]]) -> bool:
+        """Upload several files to the sandbox at once, preserving subfolders."""
+        for filename, content in files.items():
+            self._write_local(
+                filename, content.encode() if isinstance(content, str) else content
+            )
+        return True
+
+    def upload_file(self, content: str, filename: str):
+        """Upload a file to the sandbox, preserving path structure (e.g., subfolders)."""
+        return self.upload_files({filename: content})
+
+    def download_bytes(self, filename: str) -> bytes:
+        """Read a file from the sandbox."""
+        with open(os.path.join(self.workdir, filename), "rb") as f:
+            return f.read()
+
+    def download_file(self, filename: str) -> str:
+        """Download a file from the sandbox."""
+        return self.download_bytes(filename).decode()
+
+    def evaluate(self, strategy_path: str, **options) -> dict:
+        """Backtest a strategy file on a warm evaluation server.
+
+        `options` are passed through to `metrics.evaluate()` (engine, cash,
+        commission, ...), except the `timeout`, `cpu_seconds` and `max_rss_mb`
+        budgets the server enforces itself. With `series_path`, only compact
+        metrics come back and "series_path" points at the side file on the
+        host (see `load_series`). Returns the server response:
+        `{"status": "ok", "metrics", "summary"}`, or `{"status": "error" |
+        "timeout" | "oom", "error"}`. Servers are reused across calls and one
+        is started per concurrent caller.
+        """
+        try:
+            worker = self._idle_workers.get_nowait()
+        except queue.Empty:
+            worker = self._new_worker()
+
+        timeout = options.get("timeout")
+        try:
+            response = worker.request(
+                {"strategy_path": strategy_path, **options},
+                timeout=timeout + EVAL_TIMEOUT_GRACE if timeout else None,
+            )
+        except socket.timeout:
+            # The server is stuck mid-request; it can't be reused
+            worker.close()
+            return {"status": "timeout", "error": "Evaluation server did not answer"}
+        except Exception:
+            worker.close()
+            raise
+
+        self._idle_workers.put(worker)
+
+        # Side files are read from the workdir, after copying them there when
+        # it isn't shared with the sandbox
+        series_path = response.get("series_path")
+        if series_path:
+            if not self.shared_workspace:
+                self._write_local(series_path, self.download_bytes(series_path))
+            response["series_path"] = os.path.join(self.workdir, series_path)
+        return response
+
+    def _close_workers(self):
+        # shut down the evaluation servers
+        while not self._idle_workers.empty():
+            self._idle_workers.get_nowait().close()
+
+    def stop(self):
+        """Shut the sandbox down and remove its workdir."""
+        self._close_workers()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def verify_uploaded_files(self):
+        """Verify that all files and subdirectories from data_dir are in the sandbox."""
+        sandbox_paths = self._sandbox_files()
+
+        # Get corresponding local paths from data_dir
+        local_paths = []
+        for root, _, files in os.walk(self.data_dir):
+            for file in files:
+                full_path = os.path.join(root, file)
+                rel_path = os.path.relpath(full_path, self.data_dir)
+                local_paths.append(rel_path)
+
+        # Optionally compare
+        missing = [p for p in local_paths if p not in sandbox_paths]
+        missing = [
+            m for m in missing if "__pycache__" not in m and ".cache" not in m
+        ]  # Exclude __pycache__ and the data cache
+
+        if missing:
+            print("❌ Missing files in sandbox:")
+            for m in missing:
+                print("  -", m)
+        else:
+            print("✅ All files verified in sandbox.")
+
+        # check if file metrics.py exists in the sandbox
+        res = self.run_command("ls")
+        print("Files in sandbox:", res.strip().split("\n"))
+        if "metrics.py" not in res:
+            raise FileNotFoundError(
+                "metrics.py not found in the sandbox. Please upload it."
+            )
+        print("✅ metrics.py found in the sandbox.")
+
+        print("\n")
+        print("=========================================")
+        print("                Invest AI                ")
+        print("=========================================")
+
+        return sandbox_paths
@@ -0,0 +1,119 @@
+import ast
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+
+def normalize_source(code: str) -> str:
+    """Formatting- and comment-insensitive form of a strategy's source."""
+    try:
+        return ast.dump(ast.parse(code))
+    except SyntaxError:
+        return code.strip()
+
+
+class ResultCache:
+    """Persistent cache of backtest metrics, evicted least-recently-used.
+
+    Each entry is one JSON file named by its key. A hit refreshes the file's
+    mtime, and eviction deletes the oldest files until the directory is back
+    under `max_bytes`. `max_bytes=0` disables the cache.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if self.max_bytes:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(code: str, fingerprint: Dict[str, str], **settings) -> str:
+        """Key for a strategy evaluated against a data/engine `fingerprint`.
+
+        `settings` are the evaluation options (engine, broker cash and
+        commission, ...) that change the result.
+        """
+        payload = json.dumps(
+            {
+                "code": normalize_source(code),
+                "fingerprint": fingerprint,
+                "settings": settings,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.max_bytes:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                result = json.load(f)
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        if not self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def get_result_cache(directory: str, max_bytes: int) -> ResultCache:
+    """Process-wide cache instance, so hit/miss counters span generations."""
+    return ResultCache(directory, max_bytes)
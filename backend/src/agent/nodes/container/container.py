@@ -1,69 +1,105 @@
 import docker
+import hashlib
 import uuid
-import tempfile
 import os
-import shutil
 import tarfile
 import io
+from typing import Dict, List, Optional, Union
+
+from .base import SandboxRunner
+from .worker import EvalWorker
+
+# Interpreter and dependencies only; changes here rebuild the slow pip layer
+BASE_DOCKERFILE = """
+FROM python:3.11-slim
+WORKDIR /app
+ENV PIP_ROOT_USER_ACTION=ignore
+RUN pip install --no-cache-dir backtrader==1.9.78.123 pandas==2.3.0
+CMD ["tail", "-f", "/dev/null"]
+"""
+
+# Data layer on top of the base image; changes here only re-copy data/
+DATA_DOCKERFILE = """
+FROM {base_tag}
+# Copy all files directly into /app (files are already at workdir root)
+COPY . /app/
+"""
 
 
-class PersistentDockerRunner:
-    def __init__(self, data_dir="src/agent/nodes/container/data"):
+class PersistentDockerRunner(SandboxRunner):
+    def __init__(
+        self,
+        data_dir="src/agent/nodes/container/data",
+        image_tag=None,
+        cpuset_cpus=None,
+        offline=False,
+        warm_symbols=(),
+    ):
+        super().__init__(data_dir, cpuset_cpus=cpuset_cpus, warm_symbols=warm_symbols)
         self.client = docker.from_env()
         self.low_level_client = docker.APIClient(base_url="unix://var/run/docker.sock")
 
-        self.image_tag = f"agent_runner_{uuid.uuid4().hex}"
+        self.offline = offline
+
+        # Images are tagged by content and kept between runs. Runners given an
+        # existing image (e.g. in a RunnerPool) never build it.
+        self._owns_image = image_tag is None
+        self.base_tag = f"agent_runner_base:{hashlib.sha256(BASE_DOCKERFILE.encode()).hexdigest()[:16]}"
+        self.image_tag = image_tag or f"agent_runner:{self._hash_data()}"
         self.container_name = f"agent_container_{uuid.uuid4().hex}"
-        self.workdir = tempfile.mkdtemp()
         self.container = None
-        self.data_dir = data_dir  # new
-
-    def _build_image(self):
-        # Copy all files from data directory to workdir (preserving directory structure)
-        if os.path.exists(self.data_dir):
-            for root, dirs, files in os.walk(self.data_dir):
-                # Skip __pycache__ directories
-                dirs[:] = [d for d in dirs if d != "__pycache__"]
-
-                for file in files:
-                    # Skip .pyc files
-                    if file.endswith(".pyc"):
-                        continue
+        # Whether the workdir bind mount is shared with the container (a local
+        # daemon); without it files move through the Docker API
+        self.shared_workspace = False
+
+    def _hash_data(self) -> str:
+        """Content hash of the base image tag plus every file under data/."""
+        digest = hashlib.sha256(self.base_tag.encode())
+        digest.update(DATA_DOCKERFILE.encode())
+        for src_path, relative_path in self._data_files():
+            digest.update(relative_path.encode() + b"\0")
+            with open(src_path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()[:16]
+
+    def _image_exists(self, tag: str) -> bool:
+        try:
+            self.client.images.get(tag)
+            return True
+        except docker.errors.ImageNotFound:
+            return False
+
+    def _build(self, tag: str, **kwargs):
+        # Build image and stream logs
+        build_logs = self.low_level_client.build(
+            tag=tag, rm=True, decode=True, **kwargs
+        )
 
-                    src_path = os.path.join(root, file)
-                    # Preserve the relative path structure from data/ directory
-                    relative_path = os.path.relpath(src_path, self.data_dir)
-                    dest_path = os.path.join(self.workdir, relative_path)
+        for chunk in build_logs:
+            if "stream" in chunk:
+                print(chunk["stream"].strip())
+            if "error" in chunk:
+                raise RuntimeError(f"Failed to build {tag}: {chunk['error']}")
 
-                    # Create destination directory if it doesn't exist
-                    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    def _build_image(self):
+        if self._image_exists(self.image_tag):
+            print(f"Using cached image: {self.image_tag}")
+            return
+        if self.offline:
+            raise RuntimeError(
+                f"Image {self.image_tag} is not cached and offline mode is on"
+            )
 
-                    # Copy file with metadata preservation
-                    shutil.copy2(src_path, dest_path)
-                    print(f"Copied: {src_path} -> {dest_path}")
+        if not self._image_exists(self.base_tag):
+            # No build context needed, the base image only installs packages
+            self._build(self.base_tag, fileobj=io.BytesIO(BASE_DOCKERFILE.encode()))
 
         # Write Dockerfile
-        dockerfile = """
-        FROM python:3.11-slim
-        WORKDIR /app
-        # Copy all files directly into /app (files are already at workdir root)
-        COPY . /app/
-        ENV PIP_ROOT_USER_ACTION=ignore
-        RUN pip install --no-cache-dir backtrader pandas
-        CMD ["tail", "-f", "/dev/null"]
-        """
         dockerfile_path = os.path.join(self.workdir, "Dockerfile")
         with open(dockerfile_path, "w") as f:
-            f.write(dockerfile)
+            f.write(DATA_DOCKERFILE.format(base_tag=self.base_tag))
 
-        # Build image and stream logs
-        build_logs = self.low_level_client.build(
-            path=self.workdir, tag=self.image_tag, decode=True
-        )
-
-        for chunk in build_logs:
-            if "stream" in chunk:
-                print(chunk["stream"].strip())
+        self._build(self.image_tag, path=self.workdir)
 
     def _start_container(self):
         self.container = self.client.containers.run(
@@ -71,45 +107,113 @@ class PersistentDockerRunner:
             name=self.container_name,
             volumes={self.workdir: {"bind": "/app", "mode": "rw"}},
             working_dir="/app",
+            cpuset_cpus=self.cpuset_cpus,
             detach=True,
         )
 
+    def _prepare_data(self):
+        # Parse data.csv once into the memory-mapped cache under /app/.cache,
+        # shared by every evaluation through the bind mount
+        output = self.run_command("python datastore.py")
+        print(output.strip())
+
+    def _detect_shared_workspace(self) -> bool:
+        """Whether a file written to the workdir shows up at /app"""
+        probe = f".workspace-{uuid.uuid4().hex}"
+        try:
+            self._write_local(probe, probe.encode())
+            return self.run_command(f"cat {probe}").strip() == probe
+        except Exception:
+            return False
+        finally:
+            try:
+                os.remove(os.path.join(self.workdir, probe))
+            except OSError:
+                pass
+
     def start(self):
-        self._build_image()
-        self._start_container()
+        with self._timed("copy_data"):
+            self._copy_data()
+        if self._owns_image:
+            with self._timed("image_build"):
+                self._build_image()
+        with self._timed("container_start"):
+            self._start_container()
+            self.shared_workspace = self._detect_shared_workspace()
+        if not self.shared_workspace:
+            print(
+                "⚠️ [Sandbox] No shared workspace, transferring files via the Docker API"
+            )
+        with self._timed("data_prepare"):
+            self._prepare_data()
 
-    def upload_file(self, content: str, filename: str):
-        """Upload a file to the container, preserving path structure (e.g., subfolders)."""
+    def _put_archive(self, files: Dict[str, bytes]) -> bool:
+        """Send files to /app in a single tar through the Docker API"""
         tar_stream = io.BytesIO()
         with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            file_data = content.encode()
-            tarinfo = tarfile.TarInfo(name=filename)
-            tarinfo.size = len(file_data)
-            tar.addfile(tarinfo, io.BytesIO(file_data))
+            for filename, file_data in files.items():
+                tarinfo = tarfile.TarInfo(name=filename)
+                tarinfo.size = len(file_data)
+                tar.addfile(tarinfo, io.BytesIO(file_data))
         tar_stream.seek(0)
 
-        # Now send it to the container
-        result = self.client.api.put_archive(
+        return self.client.api.put_archive(
             self.container.id, path="/app", data=tar_stream.read()
         )
-        return result
-
-    def download_file(self, filename: str) -> str:
-        """Download a file from the container."""
-        exec_log = self.container.exec_run(f"cat /app/{filename}", demux=True)
-        stdout, stderr = exec_log.output
-        if stderr:
-            raise Exception(f"Error downloading file: {stderr.decode()}")
-        return (stdout or b"").decode()
 
-    def run_command(self, command: str) -> str:
-        """Run a command inside the container."""
+    def _get_archive(self, filename: str) -> bytes:
+        """Read one file from /app through the Docker API"""
+        archive, _ = self.container.get_archive(f"/app/{filename}")
+        with tarfile.open(fileobj=io.BytesIO(b"".join(archive))) as tar:
+            member = next(m for m in tar.getmembers() if m.isfile())
+            return tar.extractfile(member).read()
+
+    def upload_files(self, files: Dict[str, Union[str, bytes]]) -> bool:
+        """Upload several files to /app at once, preserving subfolders."""
+        if not self.shared_workspace:
+            return self._put_archive(
+                {
+                    filename: content.encode() if isinstance(content, str) else content
+                    for filename, content in files.items()
+                }
+            )
+        return super().upload_files(files)
+
+    def download_bytes(self, filename: str) -> bytes:
+        """Read a file from /app."""
+        if not self.shared_workspace:
+            return self._get_archive(filename)
+        return super().download_bytes(filename)
+
+    def run_command(self, command: str, timeout: Optional[float] = None) -> str:
+        """Run a command inside the container, killed after `timeout` seconds."""
+        if timeout:
+            command = f"timeout -s KILL {timeout} {command}"
         exec_log = self.container.exec_run(command, demux=True)
         stdout, stderr = exec_log.output
         if stderr:
             raise Exception(f"Error running command: {stderr.decode()}")
         return (stdout or b"").decode()
 
+    def _runtime(self) -> str:
+        # The base image pins the interpreter and package versions
+        return self.base_tag
+
+    def _new_worker(self) -> EvalWorker:
+        return EvalWorker(self.client.api, self.container.id, symbols=self.warm_symbols)
+
+    def _sandbox_files(self) -> List[str]:
+        exec_log = self.container.exec_run("find /app", demux=True)
+        stdout, _ = exec_log.output
+        container_paths = (stdout or b"").decode().strip().splitlines()
+
+        # Normalize paths (strip /app prefix)
+        return [
+            path[len("/app/") :] if path.startswith("/app/") else path
+            for path in container_paths
+            if path != "/app"
+        ]
+
     def run_code(self, code: str, filename="agent_code.py") -> str:
         filepath = os.path.join(self.workdir, filename)
         with open(filepath, "w") as f:
@@ -120,6 +224,8 @@ class PersistentDockerRunner:
         return (stdout or b"").decode() + (stderr or b"").decode()
 
     def stop(self):
+        self._close_workers()
+
         # download all files from the container to workdir
         download_dir = "downloaded_strategies"
         if self.container:
@@ -188,57 +294,8 @@ class PersistentDockerRunner:
             except Exception as e:
                 print(f"Error with container operations: {e}")
 
-        self.client.images.remove(self.image_tag, force=True)
-        shutil.rmtree(self.workdir, ignore_errors=True)
-
-    def verify_uploaded_files(self):
-        """Verify that all files and subdirectories from data_dir are in /app inside the container."""
-        # Get list of files inside container
-        exec_log = self.container.exec_run("find /app", demux=True)
-        stdout, stderr = exec_log.output
-        container_paths = (stdout or b"").decode().strip().splitlines()
-
-        # Normalize paths (strip /app prefix)
-        container_relative_paths = [
-            path[len("/app/") :] if path.startswith("/app/") else path
-            for path in container_paths
-            if path != "/app"
-        ]
-
-        # Get corresponding local paths from data_dir
-        local_paths = []
-        for root, _, files in os.walk(self.data_dir):
-            for file in files:
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, self.data_dir)
-                local_paths.append(rel_path)
-
-        # Optionally compare
-        missing = [p for p in local_paths if p not in container_relative_paths]
-        missing = [m for m in missing if "__pycache__" not in m]  # Exclude __pycache__
-
-        if missing:
-            print("❌ Missing files in container:")
-            for m in missing:
-                print("  -", m)
-        else:
-            print("✅ All files verified in container.")
-
-        # check if file metrics.py exists in the container
-        res = self.run_command("ls")
-        print("Files in container:", res.strip().split("\n"))
-        if "metrics.py" not in res:
-            raise FileNotFoundError(
-                "metrics.py not found in the container. Please upload it."
-            )
-        print("✅ metrics.py found in the container.")
-
-        print("\n")
-        print("=========================================")
-        print("                Invest AI                ")
-        print("=========================================")
-
-        return container_relative_paths
+        # The image is content-addressed and kept for the next run
+        super().stop()
 
 
 # Example usage
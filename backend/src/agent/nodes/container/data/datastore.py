@@ -0,0 +1,121 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = ".cache"
+COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def file_hash(path):
+    """Content hash of the source file, memoized on (size, mtime)."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    index_path = os.path.join(os.path.dirname(path), CACHE_DIR, "index.json")
+    stamp = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    if stamp in index:
+        return index[stamp]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    index[stamp] = digest.hexdigest()[:16]
+
+    # Best effort: a concurrent writer may win, the hash is the same either way
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path))
+    with os.fdopen(fd, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+    return index[stamp]
+
+
+def cache_path(csv_path="data.csv"):
+    """Directory holding the columnar copy of `csv_path`'s current contents."""
+    root = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR)
+    return os.path.join(root, file_hash(csv_path))
+
+
+def build_cache(csv_path="data.csv"):
+    """Parse `csv_path` once into one directory of `.npy` columns per symbol."""
+    target = cache_path(csv_path)
+    if os.path.isdir(target):
+        return target
+
+    df = pd.read_csv(csv_path, parse_dates=["Datetime"])
+    df.columns = [col.lower() for col in df.columns]
+
+    # Build in a private directory and rename it into place, so concurrent
+    # evaluations never see a half-written cache
+    staging = tempfile.mkdtemp(dir=os.path.dirname(target))
+    try:
+        symbols = []
+        for symbol, rows in df.groupby("stockname", sort=True):
+            symbol_dir = os.path.join(staging, str(symbol).replace(os.sep, "_"))
+            os.makedirs(symbol_dir)
+            rows = rows.sort_values("datetime")
+            np.save(
+                os.path.join(symbol_dir, "datetime.npy"),
+                rows["datetime"].to_numpy(dtype="datetime64[ns]").view("int64"),
+            )
+            for col in COLUMNS:
+                np.save(
+                    os.path.join(symbol_dir, f"{col}.npy"),
+                    rows[col].to_numpy(dtype="float64"),
+                )
+            symbols.append(str(symbol))
+
+        with open(os.path.join(staging, "symbols.json"), "w") as f:
+            json.dump(symbols, f)
+        os.rename(staging, target)
+    except OSError:
+        # Lost the race to another process building the same cache
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(target):
+            raise
+    return target
+
+
+def list_symbols(csv_path="data.csv"):
+    with open(os.path.join(build_cache(csv_path), "symbols.json")) as f:
+        return json.load(f)
+
+
+def load_symbol(symbol, csv_path="data.csv"):
+    """Return the OHLCV frame for `symbol` backed by read-only memory maps.
+
+    The frame has a `Datetime` index and lowercase `open`, `high`, `low`,
+    `close`, `volume` columns, the layout `bt.feeds.PandasData` expects.
+    """
+    symbol_dir = os.path.join(build_cache(csv_path), symbol.replace(os.sep, "_"))
+    if not os.path.isdir(symbol_dir):
+        raise KeyError(f"No data for symbol {symbol!r} in {csv_path}")
+
+    def column(name):
+        return np.load(os.path.join(symbol_dir, f"{name}.npy"), mmap_mode="r")
+
+    index = pd.DatetimeIndex(
+        column("datetime").view("datetime64[ns]"), name="Datetime", copy=False
+    )
+    return pd.DataFrame({col: column(col) for col in COLUMNS}, index=index, copy=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="data.csv", help="Path to the source CSV")
+    args = parser.parse_args()
+
+    path = build_cache(args.csv)
+    print(f"Data cache: {path} ({', '.join(list_symbols(args.csv))})")
@@ -0,0 +1,69 @@
+"""Opt-in early termination of hopeless backtests.
+
+`EarlyStoppingStrategy` is mixed into the strategy like
+`ActionTrackingStrategy`. It records the portfolio value every
+`CHECKPOINT_EVERY` bars and stops the run as soon as one of the configured
+rules fires:
+
+    max_drawdown      drawdown from the equity peak above this fraction
+    benchmark         [[bar, value], ...] checkpoints of the best strategy so
+                      far; stop when equity falls below
+    benchmark_ratio   this fraction of the benchmark at the same checkpoint
+    no_trade_bars     no order filled after this many bars
+
+Analyzers then report on the bars played so far, and the metrics are
+flagged with "partial" and the reason in "early_stop".
+"""
+
+import backtrader as bt
+
+CHECKPOINT_EVERY = 500
+
+
+class EarlyStoppingStrategy(bt.Strategy):
+    # Set on the combined strategy class by get_metrics()
+    early_stop_rules = {}
+
+    def __init__(self):
+        rules = self.early_stop_rules
+        self.checkpoints = []
+        self.early_stop = None
+        self._peak = None
+        self._max_drawdown = rules.get("max_drawdown")
+        self._no_trade_bars = rules.get("no_trade_bars")
+        self._benchmark_ratio = rules.get("benchmark_ratio") or 1.0
+        self._benchmark = {
+            int(bar): value for bar, value in rules.get("benchmark") or []
+        }
+
+    def _oncepost(self, dt):
+        super()._oncepost(dt)
+        self._check_early_stop()
+
+    def _next(self):
+        super()._next()
+        self._check_early_stop()
+
+    def _stop_early(self, reason, bar):
+        self.early_stop = {"reason": reason, "bar": bar}
+        self.env.runstop()
+
+    def _check_early_stop(self):
+        if self.early_stop:
+            return
+        bar = len(self)
+        value = self.broker.getvalue()
+
+        self._peak = value if self._peak is None else max(self._peak, value)
+        if self._max_drawdown and value < self._peak * (1 - self._max_drawdown):
+            return self._stop_early("drawdown", bar)
+
+        # self.actions holds the fills logged by ActionTrackingStrategy
+        if self._no_trade_bars and bar >= self._no_trade_bars and not self.actions:
+            return self._stop_early("no_trades", bar)
+
+        if bar % CHECKPOINT_EVERY == 0:
+            self.checkpoints.append([bar, value])
+            best = self._benchmark.get(bar)
+            if best is not None and value < best * self._benchmark_ratio:
+                return self._stop_early("behind_best", bar)
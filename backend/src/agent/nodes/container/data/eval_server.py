@@ -0,0 +1,104 @@
+"""Long-lived evaluation server.
+
+Reads one JSON request per line on stdin and answers with one JSON line on
+stdout, so backtrader, pandas and the market data are loaded only once per
+process instead of once per backtest:
+
+    -> {"id": "1_1", "strategy_path": "strategies/strategy-1_1.py", ...}
+    <- {"id": "1_1", "status": "ok", "metrics": {...}, "summary": "..."}
+    <- {"id": "1_1", "status": "error", "error": "Traceback ..."}
+
+A request with `"symbols": [...]` instead of `"symbol"` scores the strategy
+on all of them in parallel processes (metrics.evaluate_symbols).
+
+With `"series_path": "logs/series-1_1.npz"` the equity curve and action log
+are written to that file and only compact metrics are returned (series.py).
+
+Requests may carry `timeout` (wall-clock seconds), `cpu_seconds` and
+`max_rss_mb`; the backtest then runs in a forked child under those budgets
+and overruns answer with status "timeout" or "oom" (see limits.py).
+
+Symbols named on the command line (`python eval_server.py QQQ SPY`) are
+loaded at start-up; any other symbol is loaded by the first request for it.
+
+Anything the strategy prints goes to stderr, stdout carries only responses.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import traceback
+
+from datastore import load_symbol
+from limits import run_limited
+from metrics import evaluate, evaluate_symbols, format_summary
+from series import compact_metrics, save_series
+
+LIMITS = ("timeout", "cpu_seconds", "max_rss_mb")
+
+
+def run_evaluation(series_path=None, **options):
+    if series_path:
+        options["record_equity"] = True
+    if "symbols" in options:
+        metrics = evaluate_symbols(**options)
+    else:
+        metrics = evaluate(**options)
+    response = {"summary": format_summary(metrics)}
+
+    # Ship the summary only; the series go to a side file read on demand
+    if series_path:
+        os.makedirs(os.path.dirname(series_path) or ".", exist_ok=True)
+        save_series(metrics, series_path)
+        metrics = compact_metrics(metrics)
+        response["series_path"] = series_path
+    response["metrics"] = metrics
+    return response
+
+
+def handle(request, data):
+    # Every other request field besides "id" and the limits is an evaluate()
+    # keyword argument
+    options = {key: value for key, value in request.items() if key != "id"}
+    limits = {key: options.pop(key) for key in LIMITS if key in options}
+    if "symbols" in options:
+        # One strategy across several symbols, fanned out over processes
+        for symbol in options["symbols"]:
+            if symbol not in data:
+                data[symbol] = load_symbol(symbol)
+        options["data"] = data
+    else:
+        symbol = options.setdefault("symbol", "QQQ")
+        if symbol not in data:
+            data[symbol] = load_symbol(symbol)
+        options["data_df"] = data[symbol]
+
+    if any(limits.values()):
+        return run_limited(run_evaluation, options, **limits)
+    return {"status": "ok", **run_evaluation(**options)}
+
+
+def serve(stdin, stdout, symbols=()):
+    data = {symbol: load_symbol(symbol) for symbol in symbols}
+    stdout.write(json.dumps({"status": "ready"}) + "\n")
+    stdout.flush()
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        request = {}
+        try:
+            request = json.loads(line)
+            with contextlib.redirect_stdout(sys.stderr):
+                response = handle(request, data)
+        except Exception:
+            response = {"status": "error", "error": traceback.format_exc()}
+        response["id"] = request.get("id")
+
+        stdout.write(json.dumps(response, default=str) + "\n")
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.stdin, sys.stdout, sys.argv[1:])
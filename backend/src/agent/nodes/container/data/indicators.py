@@ -0,0 +1,308 @@
+"""Incremental rolling-window indicators for strategies.
+
+Each indicator is fed one bar at a time with `update()`, which returns the
+current value, so a strategy's `next()` costs O(1) or O(log window) instead
+of rebuilding its windows on every bar:
+
+    from indicators import RollingMean, RollingPercentile
+
+    def __init__(self):
+        self.mean = RollingMean(20)
+        self.pct = RollingPercentile(100)
+
+    def next(self):
+        mean = self.mean.update(self.data.close[0])
+        self.pct.update(self.data.volume[0])
+        if self.pct.ready and self.pct.rank(self.data.volume[0]) > 0.9:
+            ...
+"""
+
+import math
+import random
+
+# Private generator for skiplist node heights, so strategies that seed
+# `random` themselves aren't perturbed
+_rng = random.Random(0)
+
+
+class RingBuffer:
+    """Fixed-size window of the last `size` values.
+
+    Indexing is chronological like a list: `buffer[0]` is the oldest value
+    still in the window and `buffer[-1]` the newest.
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self._values = [None] * size
+        self._start = 0
+        self._count = 0
+
+    def append(self, value):
+        """Add a value; returns the value it pushed out, or None."""
+        if self._count < self.size:
+            self._values[(self._start + self._count) % self.size] = value
+            self._count += 1
+            return None
+        evicted = self._values[self._start]
+        self._values[self._start] = value
+        self._start = (self._start + 1) % self.size
+        return evicted
+
+    @property
+    def full(self):
+        return self._count == self.size
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("RingBuffer index out of range")
+        return self._values[(self._start + index) % self.size]
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._values[(self._start + index) % self.size]
+
+    def values(self):
+        """The window as a list, oldest first."""
+        return list(self)
+
+
+class RollingMean:
+    """Mean of the last `window` values."""
+
+    def __init__(self, window):
+        self.window = window
+        self._buffer = RingBuffer(window)
+        self._sum = 0.0
+        self._updates = 0
+
+    def update(self, value):
+        evicted = self._buffer.append(value)
+        self._sum += value - (evicted or 0.0)
+
+        # Re-sum once per window so floating-point drift can't accumulate
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._sum = math.fsum(self._buffer)
+        return self.value
+
+    @property
+    def value(self):
+        return self._sum / len(self._buffer) if len(self._buffer) else None
+
+    @property
+    def ready(self):
+        return self._buffer.full
+
+
+class RollingStd:
+    """Standard deviation of the last `window` values (Welford, sliding).
+
+    `ddof=0` matches `np.std`; use `ddof=1` for the sample deviation
+    (`pd.Series.rolling().std()`).
+    """
+
+    def __init__(self, window, ddof=0):
+        self.window = window
+        self.ddof = ddof
+        self._buffer = RingBuffer(window)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value):
+        evicted = self._buffer.append(value)
+        count = len(self._buffer)
+        if evicted is None:
+            delta = value - self._mean
+            self._mean += delta / count
+            self._m2 += delta * (value - self._mean)
+        else:
+            # Replace the evicted value in place: the count stays the same
+            old_mean = self._mean
+            self._mean += (value - evicted) / count
+            self._m2 += (value - evicted) * (value - self._mean + evicted - old_mean)
+        self._m2 = max(self._m2, 0.0)
+        return self.value
+
+    @property
+    def mean(self):
+        return self._mean if len(self._buffer) else None
+
+    @property
+    def value(self):
+        count = len(self._buffer)
+        if count <= self.ddof:
+            return None
+        return math.sqrt(self._m2 / (count - self.ddof))
+
+    @property
+    def ready(self):
+        return self._buffer.full
+
+
+class _Node:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, levels):
+        self.value = value
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class IndexableSkiplist:
+    """Sorted multiset with O(log n) insert, remove, indexing and rank."""
+
+    def __init__(self, expected_size=128):
+        self.levels = max(1, int(math.log2(max(expected_size, 2))) + 1)
+        self.head = _Node(None, self.levels)
+        self.head.width = [1] * self.levels
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("IndexableSkiplist index out of range")
+        node = self.head
+        index += 1
+        for level in reversed(range(self.levels)):
+            while node.next[level] is not None and node.width[level] <= index:
+                index -= node.width[level]
+                node = node.next[level]
+        return node.value
+
+    def insert(self, value):
+        # Node height is geometric with p=1/2
+        levels = min(self.levels, 1 - int(math.log2(_rng.random() or 0.5)))
+        chain = [None] * self.levels
+        steps = [0] * self.levels
+        node = self.head
+        for level in reversed(range(self.levels)):
+            while node.next[level] is not None and node.next[level].value <= value:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        new = _Node(value, levels)
+        stepped = 0
+        for level in range(levels):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - stepped
+            prev.width[level] = stepped + 1
+            stepped += steps[level]
+        for level in range(levels, self.levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value):
+        chain = [None] * self.levels
+        node = self.head
+        for level in reversed(range(self.levels)):
+            while node.next[level] is not None and node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.value != value:
+            raise KeyError(value)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def count_le(self, value):
+        """Number of elements less than or equal to `value`."""
+        node = self.head
+        count = 0
+        for level in reversed(range(self.levels)):
+            while node.next[level] is not None and node.next[level].value <= value:
+                count += node.width[level]
+                node = node.next[level]
+        return count
+
+
+class RollingPercentile:
+    """Percentiles and percentile rank over the last `window` values."""
+
+    def __init__(self, window):
+        self.window = window
+        self._buffer = RingBuffer(window)
+        self._sorted = IndexableSkiplist(window)
+
+    def update(self, value):
+        evicted = self._buffer.append(value)
+        if evicted is not None:
+            self._sorted.remove(evicted)
+        self._sorted.insert(value)
+        return self.median
+
+    def percentile(self, q):
+        """The `q`-th percentile (0-100), interpolated like `np.percentile`."""
+        count = len(self._sorted)
+        if not count:
+            return None
+        position = (count - 1) * q / 100.0
+        lower = int(math.floor(position))
+        upper = min(lower + 1, count - 1)
+        low, high = self._sorted[lower], self._sorted[upper]
+        return low + (high - low) * (position - lower)
+
+    def rank(self, value):
+        """Fraction of the window less than or equal to `value`, in [0, 1]."""
+        count = len(self._sorted)
+        return self._sorted.count_le(value) / count if count else None
+
+    @property
+    def median(self):
+        return self.percentile(50)
+
+    @property
+    def ready(self):
+        return self._buffer.full
+
+
+class OrderFlowImbalance:
+    """Buy-minus-sell share of volume over the last `window` bars, in [-1, 1].
+
+    Bars carry no bid/ask, so each bar's volume is split by where it closed
+    within its range: a close at the high counts as all buying, a close at
+    the low as all selling.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._signed = RollingMean(window)
+        self._volume = RollingMean(window)
+
+    def update(self, open, high, low, close, volume):
+        spread = high - low
+        pressure = (2 * close - high - low) / spread if spread > 0 else 0.0
+        self._signed.update(pressure * volume)
+        self._volume.update(volume)
+        return self.value
+
+    @property
+    def value(self):
+        volume = self._volume.value
+        if not volume:
+            return 0.0 if volume == 0 else None
+        return self._signed.value / volume
+
+    @property
+    def ready(self):
+        return self._volume.ready
@@ -0,0 +1,129 @@
+"""Run one evaluation in a forked child under wall-clock, CPU and memory budgets.
+
+The child inherits the server's loaded data and modules, so forking costs
+little. It runs the call and writes back a JSON response. If the child
+overruns a budget, the parent kills it and answers instead:
+
+    {"status": "timeout", "error": "..."}  wall-clock or CPU budget exceeded
+    {"status": "oom", "error": "..."}      resident memory over the cap
+
+A crashed or killed child never takes the server down with it. The child
+leads its own process group, so the pool workers it forks for symbols and
+folds (metrics.fork_map) are killed along with it.
+"""
+
+import json
+import os
+import resource
+import select
+import signal
+import sys
+import time
+import traceback
+
+POLL_INTERVAL = 0.05
+
+
+def _rss_mb(pid):
+    """Resident set size of a process in megabytes, 0 once it's gone."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+
+
+def _kill_group(pgid):
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except OSError:
+        pass  # already gone
+
+
+def _child(fn, kwargs, cpu_seconds, write_fd):
+    if cpu_seconds:
+        # SIGXCPU at the soft limit, SIGKILL a second later
+        cpu = int(cpu_seconds) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    try:
+        response = {"status": "ok", **fn(**kwargs)}
+    except MemoryError:
+        response = {"status": "oom", "error": traceback.format_exc()}
+    except Exception:
+        response = {"status": "error", "error": traceback.format_exc()}
+
+    payload = json.dumps(response, default=str).encode()
+    with os.fdopen(write_fd, "wb") as f:
+        f.write(payload)
+
+
+def run_limited(fn, kwargs, timeout=None, cpu_seconds=None, max_rss_mb=None):
+    """Call `fn(**kwargs)` in a child process and return its response dict.
+
+    `fn` must return a JSON-serializable dict; it is merged into
+    `{"status": "ok", ...}`. Limits that are None or 0 are not enforced.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.setpgid(0, 0)
+        os.close(read_fd)
+        try:
+            _child(fn, kwargs, cpu_seconds, write_fd)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(0)
+
+    # Also set from this side, so the group exists before any kill below
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass  # the child got there first
+    os.close(write_fd)
+    deadline = time.monotonic() + timeout if timeout else None
+    killed_for = None
+    chunks = []
+    with os.fdopen(read_fd, "rb") as pipe:
+        while True:
+            # Keep draining the pipe so a large response can't block the child
+            ready, _, _ = select.select([pipe], [], [], POLL_INTERVAL)
+            if ready:
+                chunk = os.read(pipe.fileno(), 1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                continue
+
+            if deadline and time.monotonic() > deadline:
+                killed_for = "timeout"
+            elif max_rss_mb and _rss_mb(pid) > max_rss_mb:
+                killed_for = "oom"
+            if killed_for:
+                _kill_group(pid)
+                break
+
+    _, status, usage = os.wait4(pid, 0)
+    if os.WIFSIGNALED(status):
+        # Workers of a child that died without shutting its pool down
+        _kill_group(pid)
+
+    if killed_for == "timeout":
+        return {"status": "timeout", "error": f"Exceeded {timeout}s wall clock"}
+    if killed_for == "oom":
+        return {"status": "oom", "error": f"Exceeded {max_rss_mb}MB resident memory"}
+    if os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        cpu_used = usage.ru_utime + usage.ru_stime
+        if sig == signal.SIGXCPU or (cpu_seconds and cpu_used >= cpu_seconds):
+            return {"status": "timeout", "error": f"Exceeded {cpu_seconds}s CPU"}
+        if sig == signal.SIGKILL:
+            # Not sent by us or the CPU limit: the kernel's OOM killer
+            return {"status": "oom", "error": "Killed by the OOM killer"}
+        return {"status": "error", "error": f"Evaluation died with signal {sig}"}
+
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError:
+        return {"status": "error", "error": "Evaluation exited without a response"}
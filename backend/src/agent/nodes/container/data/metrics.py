@@ -1,11 +1,24 @@
 import backtrader as bt
-import pandas as pd
 import argparse
 import importlib.util
+import itertools
+import multiprocessing
 import os
 import sys
 import json
 
+from datastore import load_symbol
+from early_stop import EarlyStoppingStrategy
+from profiler import ProfilingStrategy
+from series import compact_metrics, save_series
+from vector_engine import get_vector_metrics
+
+ENGINES = ("backtrader", "vector")
+
+# Default broker settings
+CASH = 100000
+COMMISSION = 0.001
+
 
 class ActionTrackingStrategy(bt.Strategy):
     def __init__(self):
@@ -28,22 +41,52 @@ class ActionTrackingStrategy(bt.Strategy):
             self.log_action(action, price)
 
 
-def get_metrics(data_df, strategy_cls, strategy_params=None):
+class EquityCurve(bt.Analyzer):
+    """Portfolio value at the close of every bar."""
+
+    def start(self):
+        self.values = []
+
+    def next(self):
+        self.values.append(self.strategy.broker.getvalue())
+
+    def get_analysis(self):
+        return self.values
+
+
+def get_metrics(
+    data_df,
+    strategy_cls,
+    strategy_params=None,
+    cash=CASH,
+    commission=COMMISSION,
+    profile=False,
+    early_stop=None,
+    record_equity=False,
+):
     cerebro = bt.Cerebro()
-    cerebro.broker.setcash(100000)
-    cerebro.broker.setcommission(commission=0.001)
+    cerebro.broker.setcash(cash)
+    cerebro.broker.setcommission(commission=commission)
 
     data = bt.feeds.PandasData(dataname=data_df)
     cerebro.adddata(data)
 
     strategy_params = strategy_params or {}
 
-    # Wrap strategy into a subclass that records actions
-    class CombinedStrategy(ActionTrackingStrategy, strategy_cls):
+    # Wrap strategy into a subclass that records actions (and timings)
+    mixins = (ActionTrackingStrategy,)
+    if profile:
+        mixins += (ProfilingStrategy,)
+    if early_stop:
+        mixins += (EarlyStoppingStrategy,)
+
+    class CombinedStrategy(*mixins, strategy_cls):
         def __init__(self, *args, **kwargs):
-            ActionTrackingStrategy.__init__(self)
+            for mixin in mixins:
+                mixin.__init__(self)
             strategy_cls.__init__(self, *args, **kwargs)
 
+    CombinedStrategy.early_stop_rules = early_stop or {}
     cerebro.addstrategy(CombinedStrategy, **strategy_params)
 
     cerebro.addanalyzer(
@@ -53,6 +96,8 @@ def get_metrics(data_df, strategy_cls, strategy_params=None):
     cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
     cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
     cerebro.addanalyzer(bt.analyzers.SQN, _name="sqn")
+    if record_equity:
+        cerebro.addanalyzer(EquityCurve, _name="equity")
 
     results = cerebro.run()
     strat = results[0]
@@ -66,6 +111,19 @@ def get_metrics(data_df, strategy_cls, strategy_params=None):
         "sqn": strat.analyzers.sqn.get_analysis(),
         "actions": strat.actions,  # buy/sell logs
     }
+    if record_equity:
+        values = strat.analyzers.equity.get_analysis()
+        metrics["equity"] = {
+            "datetime": data_df.index[len(data_df) - len(values) :],
+            "value": values,
+        }
+    if profile:
+        metrics["profile"] = strat.profile_report()
+    if early_stop:
+        metrics["checkpoints"] = strat.checkpoints
+        metrics["partial"] = strat.early_stop is not None
+        if strat.early_stop:
+            metrics["early_stop"] = {**strat.early_stop, "bars_total": len(data_df)}
 
     return metrics
 
@@ -77,66 +135,633 @@ def load_strategy_from_file(filepath):
     spec = importlib.util.spec_from_file_location(module_name, filepath)
     module = importlib.util.module_from_spec(spec)
     sys.modules[module_name] = module
-    spec.loader.exec_module(module)
+
+    # Compile from source rather than through the import system: a long-lived
+    # evaluator must not pick up a stale .pyc when a strategy file is rewritten
+    with open(filepath) as f:
+        source = f.read()
+    exec(compile(source, filepath, "exec"), module.__dict__)
 
     return module.MyStrategy
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--strategy-path", required=True, help="Path to the strategy file"
-    )
-    parser.add_argument(
-        "--result-path", required=True, help="Path to save results JSON"
-    )
+def evaluate(
+    strategy_path,
+    engine="backtrader",
+    symbol="QQQ",
+    data_df=None,
+    cash=CASH,
+    commission=COMMISSION,
+    profile=False,
+    early_stop=None,
+    folds=None,
+    workers=None,
+    record_equity=False,
+):
+    """Load a strategy file and backtest it, returning the metrics dict.
 
-    args = parser.parse_args()
+    `profile` adds a timing breakdown under "profile", and `early_stop` rules
+    (see early_stop.py) may cut the run short (backtrader engine only).
+    `folds` > 1 runs a walk-forward evaluation instead (see evaluate_folds),
+    applying both to every fold. `record_equity` adds the per-bar portfolio
+    value under "equity".
+    """
+    # Load data from the memory-mapped columnar cache (built on first use)
+    if data_df is None:
+        data_df = load_symbol(symbol)
 
-    # Load and clean data
-    df = pd.read_csv("data.csv", parse_dates=["Datetime"])
-    df.set_index("Datetime", inplace=True)
-    df = df[df["StockName"] == "QQQ"]
-    df = df[["Open", "High", "Low", "Close", "Volume"]]
-    df.columns = [col.lower() for col in df.columns]
+    if folds and folds > 1:
+        return evaluate_folds(
+            strategy_path,
+            folds,
+            data_df,
+            engine=engine,
+            workers=workers,
+            cash=cash,
+            commission=commission,
+            profile=profile,
+            early_stop=early_stop,
+            record_equity=record_equity,
+        )
 
     # Load strategy
-    strategy_cls = load_strategy_from_file(args.strategy_path)
+    strategy_cls = load_strategy_from_file(strategy_path)
 
     # Run backtest and get metrics + actions
-    metrics = get_metrics(df, strategy_cls=strategy_cls)
+    if engine == "vector":
+        return get_vector_metrics(
+            data_df,
+            strategy_cls=strategy_cls,
+            cash=cash,
+            commission=commission,
+            record_equity=record_equity,
+        )
+    return get_metrics(
+        data_df,
+        strategy_cls=strategy_cls,
+        cash=cash,
+        commission=commission,
+        profile=profile,
+        early_stop=early_stop,
+        record_equity=record_equity,
+    )
 
-    # Print key summary metrics
-    print("\n===== BACKTEST SUMMARY =====")
-    print(f"Final Portfolio Value: ${metrics['final_value']:.2f} (from $100000)")
+
+def fork_map(fn, items, workers=None):
+    """`map(fn, items)` over `workers` forked processes (all CPUs by default).
+
+    Forking lets every worker share whatever the parent already loaded.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(items))
+    # Pool workers are daemons and can't fork a pool of their own
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return [fn(item) for item in items]
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        return pool.map(fn, items, chunksize=1)
+
+
+# Set by evaluate_symbols() before forking
+_symbols_context = {}
+
+
+def _evaluate_symbol(symbol):
+    context = _symbols_context
+    try:
+        return evaluate(
+            context["strategy_path"],
+            symbol=symbol,
+            data_df=context["data"][symbol],
+            **context["options"],
+        )
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def _std(values):
+    values = [v for v in values if v is not None]
+    if len(values) < 2:
+        return None
+    mean = sum(values) / len(values)
+    return (sum((v - mean) ** 2 for v in values) / (len(values) - 1)) ** 0.5
+
+
+def combine_metrics(parts):
+    """Metrics of several backtests of one strategy, as if capital were split
+    equally between them.
+
+    Keeps the single-backtest schema (final value and return averaged, worst
+    drawdown, summed trade counts, mean Sharpe and SQN) so downstream code
+    reads it the same way.
+    """
+    trades = {
+        key: sum(m["trades"].get(key, {}).get("total", 0) for m in parts)
+        for key in ("total", "won", "lost")
+    }
+    return {
+        "final_value": _mean(m["final_value"] for m in parts),
+        "sharpe": {"sharperatio": _mean(m["sharpe"].get("sharperatio") for m in parts)},
+        "drawdown": {
+            "max": {
+                "drawdown": max(
+                    m["drawdown"].get("max", {}).get("drawdown", 0) for m in parts
+                )
+            }
+        },
+        "returns": {"rtot": _mean(m["returns"].get("rtot") for m in parts)},
+        "trades": {key: {"total": count} for key, count in trades.items()},
+        "sqn": {"sqn": _mean(m["sqn"].get("sqn") for m in parts)},
+        "actions": [],
+    }
+
+
+def combine_symbol_metrics(per_symbol):
+    """Cross-symbol metrics of one strategy (see `combine_metrics`), with
+    robustness figures under "cross_symbol" and each symbol's own metrics
+    under "symbols".
+    """
+    ok = {symbol: m for symbol, m in per_symbol.items() if "error" not in m}
+    if not ok:
+        errors = "; ".join(f"{s}: {m['error']}" for s, m in per_symbol.items())
+        raise RuntimeError(f"Evaluation failed on every symbol: {errors}")
+
+    returns = [m["returns"].get("rtot") for m in ok.values()]
+    sharpes = [
+        m["sharpe"].get("sharperatio")
+        for m in ok.values()
+        if m["sharpe"].get("sharperatio") is not None
+    ]
+    combined = combine_metrics(list(ok.values()))
+    walks = [m["walk_forward"] for m in ok.values() if "walk_forward" in m]
+    if walks:
+        combined["walk_forward"] = {
+            key: _mean(walk[key] for walk in walks)
+            for key in ("oos_sharpe", "is_sharpe", "sharpe_std", "return_std")
+        }
+        combined["walk_forward"]["folds"] = walks[0]["folds"]
+
+    return {
+        **combined,
+        "cross_symbol": {
+            "symbols": len(per_symbol),
+            "failed": sorted(set(per_symbol) - set(ok)),
+            "profitable": sum(1 for r in returns if r is not None and r > 0),
+            "sharpe_min": min(sharpes) if sharpes else None,
+            "sharpe_max": max(sharpes) if sharpes else None,
+        },
+        "symbols": per_symbol,
+    }
+
+
+def evaluate_symbols(strategy_path, symbols, data=None, workers=None, **options):
+    """Backtest one strategy on several symbols in parallel and combine them.
+
+    `data` maps symbols to already-loaded frames; missing ones are loaded
+    from the data store. `options` are passed through to `evaluate()`.
+    """
+    data = dict(data or {})
+    for symbol in symbols:
+        if symbol not in data:
+            data[symbol] = load_symbol(symbol)
+
+    _symbols_context.update(strategy_path=strategy_path, data=data, options=options)
+    results = fork_map(_evaluate_symbol, list(symbols), workers)
+    return combine_symbol_metrics(dict(zip(symbols, results)))
+
+
+def split_folds(length, folds):
+    """`(start, end)` bounds of `folds` contiguous, near-equal slices."""
+    edges = [length * index // folds for index in range(folds + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+# Set by evaluate_folds() before forking
+_folds_context = {}
+
+
+def _evaluate_fold(bounds):
+    context = _folds_context
+    start, end = bounds
+    options = dict(context["options"])
+    early_stop = context.get("early_stop")
+    if early_stop:
+        # Benchmark checkpoints are numbered over the whole series
+        options["early_stop"] = {
+            **early_stop,
+            "benchmark": [
+                [bar - start, value]
+                for bar, value in early_stop.get("benchmark") or []
+                if start < bar <= end
+            ],
+        }
+    try:
+        return context["run"](
+            context["data_df"].iloc[start:end],
+            strategy_cls=context["strategy_cls"],
+            **options,
+        )
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def merge_fold_series(bounds, results, bars_total):
+    """Actions, equity and early-stop results of the folds, laid end to end.
+
+    Every fold starts from the initial cash, so the equity curve restarts at
+    each fold boundary. Checkpoint bars are numbered over the whole series,
+    which is how the benchmark of a later run is sliced back into folds.
+    """
+    merged = {
+        "actions": list(
+            itertools.chain.from_iterable(m.get("actions") or [] for m in results)
+        )
+    }
+    equity = [m["equity"] for m in results if "equity" in m]
+    if equity:
+        merged["equity"] = {
+            "datetime": list(
+                itertools.chain.from_iterable(part["datetime"] for part in equity)
+            ),
+            "value": list(
+                itertools.chain.from_iterable(part["value"] for part in equity)
+            ),
+        }
+
+    if not any("checkpoints" in m for m in results):
+        return merged
+    merged["checkpoints"] = [
+        [start + bar, value]
+        for (start, _), metrics in zip(bounds, results)
+        for bar, value in metrics.get("checkpoints") or []
+    ]
+    stopped = [
+        (index, start, metrics["early_stop"])
+        for index, ((start, _), metrics) in enumerate(zip(bounds, results))
+        if metrics.get("early_stop")
+    ]
+    merged["partial"] = bool(stopped)
+    if stopped:
+        index, start, early_stop = stopped[0]
+        merged["early_stop"] = {
+            **early_stop,
+            "bar": start + early_stop["bar"],
+            "fold": index + 1,
+            "bars_total": bars_total,
+        }
+    return merged
+
+
+def evaluate_folds(
+    strategy_path, folds, data_df, engine="backtrader", workers=None, **options
+):
+    """Walk-forward evaluation over `folds` contiguous slices of the series.
+
+    Each slice is backtested on its own in a forked process, reading the
+    parent's memory-mapped frame. Returns the combined metrics (see
+    `combine_metrics`), a per-fold table under "folds" and their dispersion
+    under "walk_forward". The last, most recent fold is the out-of-sample
+    one: "oos_sharpe" is its Sharpe ratio, "is_sharpe" the earlier folds' mean.
+    `early_stop` rules apply to each fold on its own, and actions, equity
+    and checkpoints are merged (see `merge_fold_series`).
+    """
+    strategy_cls = load_strategy_from_file(strategy_path)
+    early_stop = options.pop("early_stop", None)
+    if engine == "vector":
+        options.pop("profile", None)
+        early_stop = None
+    bounds = split_folds(len(data_df), folds)
+    _folds_context.update(
+        run=get_vector_metrics if engine == "vector" else get_metrics,
+        data_df=data_df,
+        strategy_cls=strategy_cls,
+        options=options,
+        early_stop=early_stop,
+    )
+    results = fork_map(_evaluate_fold, bounds, workers)
+
+    rows = []
+    for (start, end), metrics in zip(bounds, results):
+        period = {
+            "start": str(data_df.index[start]),
+            "end": str(data_df.index[end - 1]),
+        }
+        if "error" in metrics:
+            rows.append({**period, "error": metrics["error"]})
+        else:
+            rows.append({**period, **sweep_row(metrics)})
+
+    ok = [metrics for metrics in results if "error" not in metrics]
+    if not ok:
+        raise RuntimeError(f"Evaluation failed on every fold: {rows[0]['error']}")
+
+    sharpes = [row.get("sharpe") for row in rows]
+    return {
+        **combine_metrics(ok),
+        **merge_fold_series(bounds, results, len(data_df)),
+        "folds": rows,
+        "walk_forward": {
+            "folds": folds,
+            "failed": sum(1 for row in rows if "error" in row),
+            "oos_sharpe": sharpes[-1],
+            "is_sharpe": _mean(sharpes[:-1]),
+            "sharpe_std": _std(sharpes),
+            "sharpe_min": min((v for v in sharpes if v is not None), default=None),
+            "return_std": _std([row.get("return") for row in rows]),
+        },
+    }
+
+
+def expand_grid(grid):
+    """Every parameter combination of a `{name: value or [values, ...]}` grid."""
+    names = list(grid)
+    choices = [value if isinstance(value, list) else [value] for value in grid.values()]
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+
+def sweep_row(metrics):
+    """Key numbers of one backtest, as a row of the sweep table."""
+    return {
+        "final_value": metrics["final_value"],
+        "sharpe": metrics["sharpe"].get("sharperatio"),
+        "return": metrics["returns"].get("rtot"),
+        "drawdown": metrics["drawdown"].get("max", {}).get("drawdown"),
+        "trades": metrics["trades"].get("total", {}).get("total", 0),
+    }
+
+
+# Set by sweep() before forking, so workers share the loaded data and strategy
+_sweep_context = {}
+
+
+def _sweep_one(params):
+    context = _sweep_context
+    try:
+        metrics = context["run"](
+            context["data_df"],
+            strategy_cls=context["strategy_cls"],
+            strategy_params=params,
+            cash=context["cash"],
+            commission=context["commission"],
+        )
+    except Exception as e:
+        return {"params": params, "error": f"{type(e).__name__}: {e}"}
+    return {"params": params, **sweep_row(metrics)}
+
+
+def sweep(
+    strategy_path,
+    grid,
+    engine="backtrader",
+    symbol="QQQ",
+    data_df=None,
+    cash=CASH,
+    commission=COMMISSION,
+    workers=None,
+    rank_by="final_value",
+):
+    """Backtest a strategy over every combination in `grid`, best first.
+
+    Data and the strategy are loaded once; combinations run in `workers`
+    forked processes (all CPUs by default). Failed combinations are kept,
+    with an "error", at the end of the table.
+    """
+    if data_df is None:
+        data_df = load_symbol(symbol)
+    strategy_cls = load_strategy_from_file(strategy_path)
+
+    unknown = set(grid) - set(strategy_cls.params._getkeys())
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+
+    combos = expand_grid(grid)
+    _sweep_context.update(
+        run=get_vector_metrics if engine == "vector" else get_metrics,
+        data_df=data_df,
+        strategy_cls=strategy_cls,
+        cash=cash,
+        commission=commission,
+    )
+    rows = fork_map(_sweep_one, combos, workers)
+
+    # Drawdown ranks ascending, everything else descending; missing values last
+    sign = 1 if rank_by == "drawdown" else -1
+    return sorted(
+        rows,
+        key=lambda row: (
+            row.get(rank_by) is None,
+            sign * (row.get(rank_by) or 0),
+        ),
+    )
+
+
+def format_sweep(rows, limit=20):
+    """Human readable table of the best sweep rows."""
+    lines = ["", f"===== PARAMETER SWEEP ({len(rows)} runs) ====="]
+    for rank, row in enumerate(rows[:limit], start=1):
+        params = ", ".join(f"{key}={value}" for key, value in row["params"].items())
+        if "error" in row:
+            lines.append(f"{rank:>3}. ERROR {row['error']} | {params}")
+            continue
+        sharpe = "N/A" if row["sharpe"] is None else f"{row['sharpe']:.2f}"
+        drawdown = "N/A" if row["drawdown"] is None else f"{row['drawdown']:.1f}%"
+        lines.append(
+            f"{rank:>3}. ${row['final_value']:.2f} | Sharpe {sharpe} | "
+            f"DD {drawdown} | trades {row['trades']} | {params}"
+        )
+    return "\n".join(lines)
+
+
+def format_summary(metrics):
+    """Human readable summary of the key metrics."""
+    lines = ["", "===== BACKTEST SUMMARY ====="]
+    if metrics.get("partial"):
+        stop = metrics["early_stop"]
+        lines.append(
+            f"Stopped early ({stop['reason']}) at bar {stop['bar']} of {stop['bars_total']}"
+        )
+    lines.append(f"Final Portfolio Value: ${metrics['final_value']:.2f} (from $100000)")
 
     # Format Sharpe Ratio
     sharpe_ratio = metrics["sharpe"].get("sharperatio", None)
     if sharpe_ratio is not None:
-        print(f"Sharpe Ratio: {sharpe_ratio:.1f}")
+        lines.append(f"Sharpe Ratio: {sharpe_ratio:.1f}")
     else:
-        print("Sharpe Ratio: N/A")
+        lines.append("Sharpe Ratio: N/A")
 
     # Format Max Drawdown as percentage
     max_drawdown = metrics["drawdown"].get("max", {}).get("drawdown", None)
     if max_drawdown is not None:
-        print(f"Max Drawdown: {max_drawdown * 100:.1f}%")
+        lines.append(f"Max Drawdown: {max_drawdown * 100:.1f}%")
     else:
-        print("Max Drawdown: N/A")
+        lines.append("Max Drawdown: N/A")
 
     # Format Total Return from analyzer (should match our calculated one)
     analyzer_return = metrics["returns"].get("rtot", None)
     if analyzer_return is not None:
-        print(f"Analyzer Total Return: {analyzer_return * 100:.1f}%")
+        lines.append(f"Analyzer Total Return: {analyzer_return * 100:.1f}%")
     else:
-        print("Analyzer Total Return: N/A")
+        lines.append("Analyzer Total Return: N/A")
 
     # Format SQN
     sqn_value = metrics["sqn"].get("sqn", None)
     if sqn_value is not None:
-        print(f"SQN: {sqn_value:.1f}")
+        lines.append(f"SQN: {sqn_value:.1f}")
     else:
-        print("SQN: N/A")
+        lines.append("SQN: N/A")
+
+    # Format walk-forward dispersion
+    walk = metrics.get("walk_forward")
+    if walk:
+        oos, is_, std = (
+            "N/A" if walk[key] is None else f"{walk[key]:.3f}"
+            for key in ("oos_sharpe", "is_sharpe", "sharpe_std")
+        )
+        lines.append(
+            f"Walk-forward ({walk['folds']} folds): OOS Sharpe {oos}, "
+            f"IS Sharpe {is_}, std {std}"
+        )
+
+    # Format cross-symbol spread
+    cross = metrics.get("cross_symbol")
+    if cross:
+        lines.append(
+            f"Symbols: {cross['profitable']}/{cross['symbols']} profitable"
+            + (f", failed: {', '.join(cross['failed'])}" if cross["failed"] else "")
+        )
+
+    # Format profile
+    profile = metrics.get("profile")
+    if profile:
+        p90 = profile["next"]["p90_ms"]
+        lines.append(
+            f"next(): {profile['next']['total']:.2f}s, p90 "
+            + ("N/A" if p90 is None else f"{p90:.3f}ms")
+            + f" | indicators {profile['indicators']:.2f}s"
+            + f" | analyzers {profile['analyzers']:.2f}s"
+            + f" | framework {profile['framework']:.2f}s"
+        )
+        for hot in profile["hot_lines"][:3]:
+            lines.append(f"  line {hot['line']}: {hot['time']:.3f}s  {hot['source']}")
+
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--strategy-path", required=True, help="Path to the strategy file"
+    )
+    parser.add_argument(
+        "--result-path", required=True, help="Path to save results JSON"
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="backtrader",
+        help="Backtest engine; `vector` requires MyStrategy.signals()",
+    )
+    parser.add_argument("--cash", type=float, default=CASH, help="Starting cash")
+    parser.add_argument(
+        "--commission", type=float, default=COMMISSION, help="Commission rate"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record next() latency, indicator/analyzer time and hot lines",
+    )
+    parser.add_argument(
+        "--early-stop",
+        metavar="RULES_JSON",
+        type=json.loads,
+        help="Early-termination rules, e.g. '{\"max_drawdown\": 0.3}'",
+    )
+    parser.add_argument(
+        "--folds",
+        type=int,
+        default=None,
+        help="Walk-forward evaluation over this many contiguous time slices",
+    )
+    parser.add_argument(
+        "--series-path",
+        help="Write equity/actions to this .npz and save compact metrics only",
+    )
+    parser.add_argument(
+        "--sweep",
+        metavar="GRID_JSON",
+        help="Backtest every combination of a {param: [values]} JSON grid",
+    )
+    parser.add_argument("--symbol", default="QQQ", help="Symbol to backtest on")
+    parser.add_argument(
+        "--symbols",
+        nargs="+",
+        help="Backtest on several symbols in parallel and combine the metrics",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Sweep / multi-symbol / fold processes (default: CPUs)",
+    )
+    parser.add_argument(
+        "--rank-by",
+        choices=("final_value", "sharpe", "return", "drawdown"),
+        default="final_value",
+        help="Sweep ranking column",
+    )
+
+    args = parser.parse_args()
+
+    if args.sweep:
+        with open(args.sweep) as f:
+            grid = json.load(f)
+        rows = sweep(
+            args.strategy_path,
+            grid,
+            engine=args.engine,
+            symbol=args.symbol,
+            cash=args.cash,
+            commission=args.commission,
+            workers=args.workers,
+            rank_by=args.rank_by,
+        )
+        print(format_sweep(rows))
+
+        if not os.path.exists(os.path.dirname(args.result_path)):
+            os.makedirs(os.path.dirname(args.result_path))
+        with open(args.result_path, "w") as f:
+            json.dump({"grid": grid, "results": rows}, f, indent=2, default=str)
+        sys.exit(0)
+
+    options = dict(
+        engine=args.engine,
+        cash=args.cash,
+        commission=args.commission,
+        profile=args.profile,
+        early_stop=args.early_stop,
+        folds=args.folds,
+        record_equity=bool(args.series_path),
+    )
+    if args.symbols:
+        metrics = evaluate_symbols(
+            args.strategy_path, args.symbols, workers=args.workers, **options
+        )
+    else:
+        metrics = evaluate(
+            args.strategy_path, symbol=args.symbol, workers=args.workers, **options
+        )
+
+    # Print key summary metrics
+    print(format_summary(metrics))
+
+    if args.series_path:
+        save_series(metrics, args.series_path)
+        metrics = compact_metrics(metrics)
 
     # Save to JSON
     if not os.path.exists(os.path.dirname(args.result_path)):
@@ -0,0 +1,149 @@
+"""Opt-in profiling of a strategy's backtest.
+
+`ProfilingStrategy` is mixed into the strategy like `ActionTrackingStrategy`
+and splits the run into indicator precomputation, the strategy's own
+`next()`, analyzers and the rest of backtrader's per-bar work (which
+includes indicator updates when cerebro runs without runonce). Every
+`LINE_SAMPLE_EVERY`-th `next()` call is also traced line by line, to find
+the strategy's hot lines; traced calls are left out of the latency
+percentiles so tracing overhead doesn't skew them.
+"""
+
+import linecache
+import sys
+import time
+from collections import defaultdict
+
+import backtrader as bt
+import numpy as np
+
+LINE_SAMPLE_EVERY = 10
+HOT_LINES = 10
+
+
+class LineProfiler:
+    """Inclusive wall time per line of one source file, via sys.settrace."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.lines = defaultdict(lambda: [0, 0.0])  # lineno -> [hits, seconds]
+
+    def trace(self, frame, event, arg):
+        if frame.f_code.co_filename != self.filename:
+            return None
+
+        last = [None, time.perf_counter()]  # line being timed, when it started
+
+        def trace_lines(frame, event, arg):
+            now = time.perf_counter()
+            if last[0] is not None:
+                self.lines[last[0]][1] += now - last[1]
+            if event == "line":
+                self.lines[frame.f_lineno][0] += 1
+                last[0] = frame.f_lineno
+            elif event == "return":
+                last[0] = None
+            last[1] = time.perf_counter()
+            return trace_lines
+
+        return trace_lines
+
+    def hot_lines(self, limit=HOT_LINES):
+        ranked = sorted(self.lines.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {
+                "line": lineno,
+                "hits": hits,
+                "time": seconds,
+                "source": linecache.getline(self.filename, lineno).strip(),
+            }
+            for lineno, (hits, seconds) in ranked[:limit]
+        ]
+
+
+class ProfilingStrategy(bt.Strategy):
+    def __init__(self):
+        self._profile_next = []  # seconds per untraced next() call
+        self._profile_time = defaultdict(float)
+        self._profile_bars = 0
+
+        # Trace the file of the next() this mixin wraps
+        mro = type(self).__mro__
+        owner = next(
+            cls
+            for cls in mro[mro.index(ProfilingStrategy) + 1 :]
+            if "next" in vars(cls)
+        )
+        self._line_profiler = LineProfiler(owner.next.__code__.co_filename)
+
+    def _timed(self, key, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._profile_time[key] += time.perf_counter() - started
+
+    # Indicators precomputed over the whole series (runonce mode)
+    def _once(self):
+        return self._timed("indicators", super()._once)
+
+    # One bar, in runonce and in next mode respectively
+    def _oncepost(self, dt):
+        self._profile_bars += 1
+        return self._timed("bars", super()._oncepost, dt)
+
+    def _next(self):
+        self._profile_bars += 1
+        return self._timed("bars", super()._next)
+
+    def _next_analyzers(self, minperstatus, once=False):
+        return self._timed("analyzers", super()._next_analyzers, minperstatus, once)
+
+    def next(self):
+        traced = len(self._profile_next) % LINE_SAMPLE_EVERY == LINE_SAMPLE_EVERY - 1
+        if traced:
+            sys.settrace(self._line_profiler.trace)
+        started = time.perf_counter()
+        try:
+            return super().next()
+        finally:
+            elapsed = time.perf_counter() - started
+            if traced:
+                sys.settrace(None)
+                self._profile_time["traced_next"] += elapsed
+            self._profile_next.append(None if traced else elapsed)
+
+    def profile_report(self):
+        """Timing breakdown of the run, in seconds unless noted."""
+        latencies = np.array([t for t in self._profile_next if t is not None])
+        if len(latencies):
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+            latency = {
+                "p50_ms": p50,
+                "p90_ms": p90,
+                "p99_ms": p99,
+                "max_ms": latencies.max() * 1000,
+            }
+        else:
+            latency = {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+
+        # Traced calls are counted at the untraced mean
+        mean = latencies.mean() if len(latencies) else 0.0
+        traced_calls = len(self._profile_next) - len(latencies)
+        next_total = latencies.sum() + mean * traced_calls
+        bars_total = (
+            self._profile_time["bars"]
+            - self._profile_time["traced_next"]
+            + mean * traced_calls
+        )
+        analyzers = self._profile_time["analyzers"]
+
+        return {
+            "bars": self._profile_bars,
+            "next_calls": len(self._profile_next),
+            "next": {"total": next_total, **latency},
+            "indicators": self._profile_time["indicators"],
+            "analyzers": analyzers,
+            "framework": max(bars_total - next_total - analyzers, 0.0),
+            "hot_lines": self._line_profiler.hot_lines(),
+        }
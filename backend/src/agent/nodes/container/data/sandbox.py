@@ -0,0 +1,50 @@
+"""Restricted imports for strategy code run outside a container.
+
+    python sandbox.py eval_server.py [args...]
+
+runs the given script after installing an import hook: modules executed
+from the `strategies/` folder may only import the top-level packages listed
+in the SANDBOX_ALLOWED_IMPORTS environment variable (comma-separated).
+Imports made by the harness and by the allowed packages themselves are not
+affected. Without the variable the script runs unrestricted.
+
+This keeps generated strategies off the filesystem, network and process
+APIs by accident; it is not a security boundary like a container.
+"""
+
+import builtins
+import os
+import runpy
+import sys
+
+STRATEGY_DIR = os.path.abspath("strategies") + os.sep
+
+
+def install(allowed):
+    """Wrap __import__ so strategy modules can only import `allowed`."""
+    allowed = frozenset(allowed)
+    original_import = builtins.__import__
+
+    def restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+        # The caller's frame tells who imports, also for direct __import__ calls
+        caller = sys._getframe(1).f_globals.get("__file__") or ""
+        if (
+            level == 0
+            and os.path.abspath(caller).startswith(STRATEGY_DIR)
+            and name.partition(".")[0] not in allowed
+        ):
+            raise ImportError(f"Import of '{name}' is not allowed in strategies")
+        return original_import(name, globals, locals, fromlist, level)
+
+    builtins.__import__ = restricted_import
+
+
+if __name__ == "__main__":
+    allowed = os.environ.get("SANDBOX_ALLOWED_IMPORTS")
+    if allowed is not None:
+        install(name.strip() for name in allowed.split(",") if name.strip())
+
+    script = sys.argv[1]
+    sys.argv = sys.argv[1:]
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    runpy.run_path(script, run_name="__main__")
@@ -0,0 +1,107 @@
+"""Compact backtest results.
+
+The full metrics carry every buy/sell action, the per-bar equity curve and
+backtrader's whole TradeAnalyzer tree. `save_series()` moves the series into
+a columnar `.npz` side file:
+
+    equity_time, equity_value                  int64 ns, float64 per bar
+    action_time, action_side, action_price     int64 ns, int8 (+1 buy,
+                                               -1 sell), float64 per order
+
+(keys prefixed with "<SYMBOL>/" for multi-symbol results), and
+`compact_metrics()` keeps only the summary numbers, so what is sent back,
+stored and shown to the LLM stays small.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Optional result sections that are already small, kept as they are
+PASSTHROUGH = (
+    "profile",
+    "checkpoints",
+    "partial",
+    "early_stop",
+    "folds",
+    "walk_forward",
+    "cross_symbol",
+)
+
+
+def _series_arrays(metrics):
+    arrays = {}
+    equity = metrics.get("equity")
+    if equity is not None:
+        arrays["equity_time"] = pd.DatetimeIndex(equity["datetime"]).asi8
+        arrays["equity_value"] = np.asarray(equity["value"], dtype=np.float64)
+
+    actions = metrics.get("actions") or []
+    arrays["action_time"] = pd.DatetimeIndex(
+        [action["datetime"] for action in actions]
+    ).asi8
+    arrays["action_side"] = np.array(
+        [1 if action["action"] == "buy" else -1 for action in actions], dtype=np.int8
+    )
+    arrays["action_price"] = np.array(
+        [action["price"] for action in actions], dtype=np.float64
+    )
+    return arrays
+
+
+def save_series(metrics, path):
+    """Write the equity and action series of `metrics` to an .npz file."""
+    symbols = metrics.get("symbols")
+    arrays = {} if symbols else _series_arrays(metrics)
+    for symbol, symbol_metrics in (symbols or {}).items():
+        if "error" not in symbol_metrics:
+            for key, array in _series_arrays(symbol_metrics).items():
+                arrays[f"{symbol}/{key}"] = array
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def compact_metrics(metrics):
+    """Summary numbers of a full metrics dict, in the same nesting."""
+    trades = metrics["trades"]
+    max_drawdown = metrics["drawdown"].get("max", {})
+    compact = {
+        "final_value": metrics["final_value"],
+        "sharpe": {"sharperatio": metrics["sharpe"].get("sharperatio")},
+        "drawdown": {
+            "max": {
+                key: max_drawdown.get(key)
+                for key in ("drawdown", "moneydown", "len")
+                if key in max_drawdown
+            }
+        },
+        "returns": {
+            key: metrics["returns"].get(key)
+            for key in ("rtot", "rnorm100")
+            if key in metrics["returns"]
+        },
+        "trades": {
+            "total": {
+                key: trades.get("total", {}).get(key, 0)
+                for key in ("total", "open", "closed")
+            },
+            "won": {"total": trades.get("won", {}).get("total", 0)},
+            "lost": {"total": trades.get("lost", {}).get("total", 0)},
+        },
+        "sqn": {"sqn": metrics["sqn"].get("sqn")},
+        "action_count": len(metrics.get("actions") or []),
+    }
+    pnl = trades.get("pnl", {}).get("net", {})
+    if pnl:
+        compact["trades"]["pnl"] = {
+            "net": {key: pnl.get(key) for key in ("total", "average")}
+        }
+
+    for key in PASSTHROUGH:
+        if key in metrics:
+            compact[key] = metrics[key]
+    if "symbols" in metrics:
+        compact["symbols"] = {
+            symbol: m if "error" in m else compact_metrics(m)
+            for symbol, m in metrics["symbols"].items()
+        }
+    return compact
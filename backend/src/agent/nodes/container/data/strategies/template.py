@@ -35,3 +35,12 @@ class TemplateStrategy(bt.Strategy):
         Add your trading logic here.
         """
         pass  # TODO: Add entry/exit logic here
+
+    @staticmethod
+    def signals(data, params):
+        """
+        Optional, used by `metrics.py --engine vector`.
+        Return the target exposure (-1.0 short .. 1.0 long) for every bar,
+        computed from `data` columns with vectorized operations.
+        """
+        return np.zeros(len(data))
@@ -0,0 +1,251 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+RISK_FREE_RATE = 0.01  # same default as bt.analyzers.SharpeRatio
+TRADING_DAYS = 252
+
+
+def get_signal_params(strategy_cls, strategy_params=None):
+    """Merge the strategy's declared `params` defaults with any overrides."""
+    params = dict(strategy_cls.params()._getkwargs())
+    params.update(strategy_params or {})
+    return params
+
+
+def get_signals(data_df, strategy_cls, strategy_params=None):
+    """Call `MyStrategy.signals(data, params)` and return target exposures.
+
+    The strategy decides its exposure (-1.0 short .. 1.0 long) at the close of
+    each bar. The order is filled at the next bar's open, like a market order
+    in backtrader.
+    """
+    signal_fn = getattr(strategy_cls, "signals", None)
+    if signal_fn is None:
+        raise AttributeError(
+            "MyStrategy must define a `signals(data, params)` staticmethod "
+            "to run with the vector engine"
+        )
+
+    params = get_signal_params(strategy_cls, strategy_params)
+    signals = np.asarray(signal_fn(data_df, params), dtype=np.float64)
+    if signals.shape != (len(data_df),):
+        raise ValueError(
+            f"signals() returned shape {signals.shape}, expected ({len(data_df)},)"
+        )
+    return np.clip(np.nan_to_num(signals, nan=0.0), -1.0, 1.0)
+
+
+def _daily_returns(index, equity, cash):
+    """Day-end returns, mirroring bt.analyzers.TimeReturn(timeframe=Days)."""
+    days = pd.DatetimeIndex(index).normalize()
+    last_of_day = np.flatnonzero(np.r_[days[1:] != days[:-1], True])
+    day_values = equity[last_of_day]
+    return np.diff(np.r_[cash, day_values]) / np.r_[cash, day_values[:-1]]
+
+
+def _sharpe(daily_returns):
+    rate = math.pow(1.0 + RISK_FREE_RATE, 1.0 / TRADING_DAYS) - 1.0
+    excess = daily_returns - rate
+    if len(excess) == 0:
+        return {"sharperatio": None}
+    stddev = excess.std()
+    if not stddev:
+        return {"sharperatio": None}
+    return {"sharperatio": float(excess.mean() / stddev)}
+
+
+def _drawdown(equity):
+    peak = np.maximum.accumulate(equity)
+    moneydown = peak - equity
+    drawdown = 100.0 * moneydown / peak
+
+    # Bars since the last equity peak
+    at_peak = moneydown <= 0
+    last_peak = np.maximum.accumulate(np.where(at_peak, np.arange(len(equity)), 0))
+    lengths = np.arange(len(equity)) - last_peak
+
+    return {
+        "len": int(lengths[-1]),
+        "drawdown": float(drawdown[-1]),
+        "moneydown": float(moneydown[-1]),
+        "max": {
+            "len": int(lengths.max()),
+            "drawdown": float(drawdown.max()),
+            "moneydown": float(moneydown.max()),
+        },
+    }
+
+
+def _returns(equity, cash, n_days):
+    rtot = math.log(equity[-1] / cash)
+    ravg = rtot / n_days if n_days else 0.0
+    rnorm = math.expm1(ravg * TRADING_DAYS)
+    return {"rtot": rtot, "ravg": ravg, "rnorm": rnorm, "rnorm100": rnorm * 100.0}
+
+
+def _stats(values):
+    if len(values) == 0:
+        return {"total": 0.0, "average": 0.0, "max": 0.0}
+    return {
+        "total": float(values.sum()),
+        "average": float(values.mean()),
+        "max": float(values[np.abs(values).argmax()]),
+    }
+
+
+def _trades(net, gross, lengths, is_open):
+    """A condensed bt.analyzers.TradeAnalyzer tree for the closed trades."""
+    if len(net) == 0 and not is_open:
+        return {"total": {"total": 0}}
+
+    total = {"total": len(net) + int(is_open), "open": int(is_open)}
+    if len(net) == 0:
+        return {"total": total}
+    total["closed"] = len(net)
+
+    won = net > 0
+    lost = ~won
+    streak = {}
+    for name, mask in (("won", won), ("lost", lost)):
+        # Runs of consecutive True values
+        edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+        runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        streak[name] = {
+            "current": int(runs[-1]) if mask[-1] else 0,
+            "longest": int(runs.max()) if len(runs) else 0,
+        }
+
+    return {
+        "total": total,
+        "streak": streak,
+        "pnl": {
+            "gross": {"total": float(gross.sum()), "average": float(gross.mean())},
+            "net": {"total": float(net.sum()), "average": float(net.mean())},
+        },
+        "won": {"total": int(won.sum()), "pnl": _stats(net[won])},
+        "lost": {"total": int(lost.sum()), "pnl": _stats(net[lost])},
+        "len": {
+            "total": int(lengths.sum()),
+            "average": float(lengths.mean()),
+            "max": int(lengths.max()),
+            "min": int(lengths.min()),
+        },
+    }
+
+
+def _sqn(net):
+    if len(net) > 1 and net.std():
+        sqn = math.sqrt(len(net)) * net.mean() / net.std()
+    else:
+        sqn = 0
+    return {"sqn": float(sqn), "trades": len(net)}
+
+
+def get_vector_metrics(
+    data_df,
+    strategy_cls,
+    strategy_params=None,
+    cash=100000,
+    commission=0.001,
+    record_equity=False,
+):
+    """Vectorized counterpart of `get_metrics()` with the same result schema.
+
+    Positions are held as a fixed number of shares between signal changes, so
+    one "segment" is a run of bars with the same target exposure. Everything
+    below works on per-bar or per-segment arrays; there is no per-bar loop.
+    """
+    signals = get_signals(data_df, strategy_cls, strategy_params)
+    opens = data_df["open"].to_numpy(dtype=np.float64)
+    closes = data_df["close"].to_numpy(dtype=np.float64)
+    n = len(closes)
+
+    # Exposure held during bar t was decided at the close of bar t - 1
+    position = np.r_[0.0, signals[:-1]]
+
+    # Segments start at bar 0 and wherever the target exposure changes
+    starts = np.flatnonzero(np.r_[True, position[1:] != position[:-1]])
+    segment = np.cumsum(np.r_[True, position[1:] != position[:-1]]) - 1
+    weight = position[starts]
+    entry = opens[starts]
+    exit_ = np.r_[opens[starts[1:]], closes[-1]]
+
+    # Growth of the segment's equity from its entry open to its exit open,
+    # and the exposure it has drifted to by then
+    growth = 1.0 + weight * (exit_ / entry - 1.0)
+    drift = np.divide(
+        weight * exit_ / entry, growth, out=np.zeros_like(growth), where=growth != 0
+    )
+
+    # Commission is charged on the value traded when rebalancing at the open
+    turnover = np.abs(weight - np.r_[0.0, drift[:-1]])
+    cost = commission * turnover
+    start_equity = cash * np.r_[1.0, np.cumprod((1.0 - cost) * growth)[:-1]]
+    invested = start_equity * (1.0 - cost)
+
+    equity = invested[segment] * (
+        1.0 + weight[segment] * (closes / entry[segment] - 1.0)
+    )
+
+    # Actions: every rebalance with non-zero turnover is an executed order
+    traded = turnover > 0
+    index = data_df.index
+    actions = [
+        {
+            "datetime": index[i].isoformat(),
+            "action": "buy" if buy else "sell",
+            "price": float(price),
+        }
+        for i, buy, price in zip(
+            starts[traded],
+            (weight > np.r_[0.0, drift[:-1]])[traded],
+            entry[traded],
+        )
+    ]
+
+    # Trades: maximal runs of segments holding the same non-zero direction
+    direction = np.sign(weight)
+    new_trade = (direction != 0) & (direction != np.r_[0.0, direction[:-1]])
+    trade = np.cumsum(new_trade) - 1
+    in_trade = direction != 0
+    trade_net = np.array([])
+    trade_gross = np.array([])
+    trade_len = np.array([], dtype=np.int64)
+    is_open = bool(in_trade[-1])
+    if in_trade.any():
+        ids = trade[in_trade]
+        gross = np.bincount(ids, weights=(invested * (growth - 1.0))[in_trade])
+        fees = np.bincount(ids, weights=(start_equity * cost)[in_trade])
+        last_segment = np.flatnonzero(np.r_[ids[1:] != ids[:-1], True])
+        last_segment = np.flatnonzero(in_trade)[last_segment]
+        end_equity = (
+            start_equity[last_segment]
+            * (1.0 - cost[last_segment])
+            * growth[last_segment]
+        )
+        fees = fees + commission * np.abs(drift[last_segment]) * end_equity
+        first_bar = starts[np.flatnonzero(new_trade)]
+        last_bar = np.r_[starts[1:], n][last_segment]
+
+        closed = slice(None, -1) if is_open else slice(None)
+        trade_gross = gross[closed]
+        trade_net = (gross - fees)[closed]
+        trade_len = (last_bar - first_bar)[closed]
+
+    daily = _daily_returns(index, equity, cash)
+
+    metrics = {
+        "final_value": float(equity[-1]),
+        "sharpe": _sharpe(daily),
+        "drawdown": _drawdown(equity),
+        "returns": _returns(equity, cash, len(daily)),
+        "trades": _trades(trade_net, trade_gross, trade_len, is_open),
+        "sqn": _sqn(trade_net),
+        "actions": actions,  # buy/sell logs
+    }
+    if record_equity:
+        metrics["equity"] = {"datetime": index, "value": equity}
+
+    return metrics
@@ -0,0 +1,141 @@
+import os
+import platform
+import resource
+import shlex
+import shutil
+import subprocess
+import sys
+from importlib import metadata
+from typing import List, Optional
+
+from .base import SandboxRunner
+from .validate import ALLOWED_IMPORTS
+from .worker import LocalEvalWorker
+
+# Largest file a sandboxed process may write
+MAX_FILE_MB = 1024
+
+
+def _limit_process(
+    pid: int, cpuset_cpus: Optional[str], cpu_seconds: Optional[float] = None
+):
+    """Apply the sandbox's rlimits and CPU pinning to a just-started process.
+
+    Set from the parent right after the spawn rather than in a preexec_fn,
+    which isn't safe while other threads run; children forked later inherit
+    them.
+    """
+    resource.prlimit(pid, resource.RLIMIT_CORE, (0, 0))
+    file_bytes = MAX_FILE_MB << 20
+    resource.prlimit(pid, resource.RLIMIT_FSIZE, (file_bytes, file_bytes))
+    if cpu_seconds:
+        cpu = int(cpu_seconds) + 1
+        resource.prlimit(pid, resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if cpuset_cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(pid, {int(cpu) for cpu in cpuset_cpus.split(",")})
+
+
+class LocalSandboxRunner(SandboxRunner):
+    """Runs strategies in subprocesses of the host interpreter.
+
+    A lightweight stand-in for PersistentDockerRunner when Docker isn't
+    available (CI, benchmarks): the workdir is a temp dir, processes get
+    rlimits and the runner's CPUs, and strategy modules may only import
+    ALLOWED_IMPORTS (see data/sandbox.py). It does not isolate the
+    filesystem or network the way a container does.
+    """
+
+    def __init__(
+        self,
+        data_dir="src/agent/nodes/container/data",
+        cpuset_cpus=None,
+        warm_symbols=(),
+    ):
+        super().__init__(data_dir, cpuset_cpus=cpuset_cpus, warm_symbols=warm_symbols)
+        self.env = {
+            **os.environ,
+            "SANDBOX_ALLOWED_IMPORTS": ",".join(sorted(ALLOWED_IMPORTS)),
+            "PYTHONDONTWRITEBYTECODE": "1",
+        }
+
+    def _python(self, args: List[str]) -> List[str]:
+        # Python scripts start through the import-restricting launcher
+        if args and args[0] == "python" and len(args) > 1:
+            if args[1].endswith(".py"):
+                return [sys.executable, "sandbox.py"] + args[1:]
+            return [sys.executable] + args[1:]
+        return args
+
+    def start(self):
+        with self._timed("copy_data"):
+            self._copy_data()
+        # Parse data.csv once into the memory-mapped cache under .cache,
+        # shared by every evaluation
+        with self._timed("data_prepare"):
+            output = self.run_command("python datastore.py")
+        print(output.strip())
+
+    def run_command(self, command: str, timeout: Optional[float] = None) -> str:
+        """Run a command in the workdir, killed after `timeout` seconds."""
+        process = subprocess.Popen(
+            self._python(shlex.split(command)),
+            cwd=self.workdir,
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            _limit_process(process.pid, self.cpuset_cpus, timeout)
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            process.kill()
+            process.communicate()
+            raise Exception(f"Command timed out after {timeout}s: {command}") from e
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        if stderr:
+            raise Exception(f"Error running command: {stderr.decode()}")
+        return stdout.decode()
+
+    def _runtime(self) -> str:
+        versions = []
+        for package in ("backtrader", "pandas", "numpy"):
+            try:
+                versions.append(f"{package}=={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                versions.append(f"{package}==none")
+        return f"local:python{platform.python_version()}:" + ",".join(versions)
+
+    def _new_worker(self) -> LocalEvalWorker:
+        return LocalEvalWorker(
+            self._python(["python", "eval_server.py", *self.warm_symbols]),
+            cwd=self.workdir,
+            env=self.env,
+            on_start=lambda pid: _limit_process(pid, self.cpuset_cpus),
+        )
+
+    def _sandbox_files(self) -> List[str]:
+        paths = []
+        for root, dirs, files in os.walk(self.workdir):
+            for name in dirs + files:
+                paths.append(os.path.relpath(os.path.join(root, name), self.workdir))
+        return paths
+
+    def stop(self):
+        self._close_workers()
+
+        # Keep the generated strategies, like the Docker runner does
+        strategies = os.path.join(self.workdir, "strategies")
+        if os.path.isdir(strategies):
+            download_dir = os.path.join("downloaded_strategies", "strategies")
+            shutil.copytree(
+                strategies,
+                download_dir,
+                ignore=shutil.ignore_patterns("__pycache__"),
+                dirs_exist_ok=True,
+            )
+            print(f"Downloaded strategies folder to: {download_dir}")
+
+        super().stop()
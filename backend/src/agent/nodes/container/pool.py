@@ -0,0 +1,156 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from .container import PersistentDockerRunner
+from .local import LocalSandboxRunner
+
+BACKENDS = ("docker", "local")
+
+
+def split_cpus(size: int) -> List[str]:
+    """Partition the CPUs available to us into `size` docker cpuset strings."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+
+    if len(cpus) < size:
+        # Fewer cores than containers: let containers share all of them
+        return [",".join(map(str, cpus))] * size
+
+    per_runner, extra = divmod(len(cpus), size)
+    cpusets, start = [], 0
+    for index in range(size):
+        end = start + per_runner + (1 if index < extra else 0)
+        cpusets.append(",".join(map(str, cpus[start:end])))
+        start = end
+    return cpusets
+
+
+class RunnerPool:
+    """A fixed set of sandboxes, each pinned to its own CPUs.
+
+    Solutions lease a sandbox for their compile -> evaluate step, so
+    concurrent backtests no longer share one cgroup. `backend` is one of
+    BACKENDS: Docker containers or local subprocess sandboxes.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        data_dir="src/agent/nodes/container/data",
+        offline=False,
+        backend="docker",
+        warm_symbols=(),
+    ):
+        if size < 1:
+            raise ValueError("RunnerPool size must be at least 1")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown sandbox backend: {backend}")
+
+        cpusets = split_cpus(size)
+        if backend == "local":
+            self.runners = [
+                LocalSandboxRunner(
+                    data_dir, cpuset_cpus=cpuset, warm_symbols=warm_symbols
+                )
+                for cpuset in cpusets
+            ]
+        else:
+            # The first runner builds the image, the others reuse it
+            owner = PersistentDockerRunner(
+                data_dir,
+                cpuset_cpus=cpusets[0],
+                offline=offline,
+                warm_symbols=warm_symbols,
+            )
+            self.runners = [owner] + [
+                PersistentDockerRunner(
+                    data_dir,
+                    image_tag=owner.image_tag,
+                    cpuset_cpus=cpuset,
+                    warm_symbols=warm_symbols,
+                )
+                for cpuset in cpusets[1:]
+            ]
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._leases = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._busy_seconds = [0.0] * size
+
+    @property
+    def size(self) -> int:
+        return len(self.runners)
+
+    def start(self):
+        # Build the shared image once, then start the remaining sandboxes
+        self.runners[0].start()
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            list(executor.map(lambda runner: runner.start(), self.runners[1:]))
+
+        for index in range(self.size):
+            self._idle.put(index)
+        self._started_at = time.monotonic()
+
+    def verify_uploaded_files(self):
+        for runner in self.runners:
+            container_paths = runner.verify_uploaded_files()
+        return container_paths
+
+    def fingerprint(self) -> Dict[str, str]:
+        # Every sandbox runs the same runtime and data
+        return self.runners[0].fingerprint()
+
+    @contextmanager
+    def lease(self):
+        """Block until a sandbox is free and hand it out exclusively."""
+        requested = time.monotonic()
+        index = self._idle.get()
+        leased = time.monotonic()
+
+        with self._lock:
+            self._leases += 1
+            self._wait_seconds += leased - requested
+            self._max_wait_seconds = max(self._max_wait_seconds, leased - requested)
+
+        try:
+            yield self.runners[index]
+        finally:
+            with self._lock:
+                self._busy_seconds[index] += time.monotonic() - leased
+            self._idle.put(index)
+
+    def stats(self) -> Dict[str, Any]:
+        """Lease count, wait times and per-sandbox utilization so far."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+            return {
+                "size": self.size,
+                "leases": self._leases,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_avg": (
+                    self._wait_seconds / self._leases if self._leases else 0.0
+                ),
+                "wait_seconds_max": self._max_wait_seconds,
+                "utilization": [
+                    busy / elapsed if elapsed else 0.0 for busy in self._busy_seconds
+                ],
+                "cpusets": [runner.cpuset_cpus for runner in self.runners],
+            }
+
+    def stop(self):
+        print(f"[Pool] {self.stats()}")
+        for index, runner in enumerate(self.runners):
+            try:
+                runner.stop()
+            except Exception as e:
+                print(f"Error stopping runner {index}: {e}")
@@ -0,0 +1,94 @@
+import ast
+from typing import List
+
+# Top-level modules a strategy may import; everything else is rejected before
+# the code reaches a sandbox
+ALLOWED_IMPORTS = frozenset(
+    {
+        "backtrader",
+        "pandas",
+        "numpy",
+        "math",
+        "datetime",
+        "collections",
+        "itertools",
+        "functools",
+        "statistics",
+        "typing",
+        "indicators",
+    }
+)
+
+
+def _strategy_bases(tree: ast.Module) -> set:
+    """Source spellings that refer to `backtrader.Strategy` in this module."""
+    bases = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == "backtrader":
+                    bases.add(f"{alias.asname or alias.name}.Strategy")
+        elif isinstance(node, ast.ImportFrom) and node.module == "backtrader":
+            for alias in node.names:
+                if alias.name == "Strategy":
+                    bases.add(alias.asname or alias.name)
+    return bases
+
+
+def validate_strategy(code: str, filename: str = "<strategy>") -> List[str]:
+    """Check a strategy's source without running it.
+
+    Returns a list of problems, empty when the code compiles, imports only
+    `ALLOWED_IMPORTS`, and defines `MyStrategy(bt.Strategy)` whose `__init__`
+    takes no arguments besides `self`.
+    """
+    try:
+        tree = ast.parse(code, filename)
+        compile(tree, filename, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return [f"{type(e).__name__} at line {e.lineno}: {e.msg}"]
+
+    problems = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [("." * node.level) + (node.module or "")]
+        else:
+            continue
+        for module in modules:
+            if module.split(".")[0] not in ALLOWED_IMPORTS:
+                problems.append(
+                    f"Import of '{module}' at line {node.lineno} is not allowed"
+                )
+
+    strategy = next(
+        (
+            node
+            for node in tree.body
+            if isinstance(node, ast.ClassDef) and node.name == "MyStrategy"
+        ),
+        None,
+    )
+    if strategy is None:
+        problems.append("No top-level class named 'MyStrategy'")
+        return problems
+
+    bases = _strategy_bases(tree)
+    if not any(ast.unparse(base) in bases for base in strategy.bases):
+        problems.append("MyStrategy must subclass bt.Strategy")
+
+    for node in strategy.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "__init__":
+            args = node.args
+            if (
+                len(args.posonlyargs) + len(args.args) != 1
+                or args.vararg
+                or args.kwonlyargs
+                or args.kwarg
+            ):
+                problems.append(
+                    f"MyStrategy.__init__ at line {node.lineno} must take only 'self'"
+                )
+
+    return problems
@@ -0,0 +1,203 @@
+import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import subprocess
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+STDOUT = 1
+STDERR = 2
+
+
+class EvalWorker:
+    """Client for one `eval_server.py` process running inside the container.
+
+    The process is started with `docker exec` and talks JSON lines over the
+    attached stdin/stdout socket, so every evaluation after the first skips
+    interpreter start-up, imports and data loading.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        container_id: str,
+        timeout: Optional[float] = None,
+        symbols: Sequence[str] = (),
+    ):
+        exec_id = api_client.exec_create(
+            container_id,
+            ["python", "eval_server.py", *symbols],
+            stdin=True,
+            stdout=True,
+            stderr=True,
+            workdir="/app",
+        )["Id"]
+        sock = api_client.exec_start(exec_id, socket=True)
+        # docker-py hands back a SocketIO wrapper around the real socket
+        self._sock = getattr(sock, "_sock", sock)
+        self._sock.settimeout(timeout)
+        self._buffer = b""
+        self.stderr = b""
+
+        ready = self._read_response()
+        if ready.get("status") != "ready":
+            raise RuntimeError(f"Evaluation server failed to start: {ready}")
+
+    def _read_exactly(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise EOFError(
+                    f"Evaluation server exited: {self.stderr.decode(errors='replace')}"
+                )
+            data += chunk
+        return data
+
+    def _read_response(self) -> Dict[str, Any]:
+        # Docker multiplexes stdout and stderr into frames with an 8-byte header
+        while b"\n" not in self._buffer:
+            stream, size = struct.unpack(">BxxxL", self._read_exactly(8))
+            data = self._read_exactly(size)
+            if stream == STDOUT:
+                self._buffer += data
+            elif stream == STDERR:
+                self.stderr = (self.stderr + data)[-65536:]
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def request(
+        self, payload: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send one request and wait up to `timeout` seconds for its response.
+
+        Raises `socket.timeout` when the server doesn't answer in time; the
+        worker must then be closed.
+        """
+        self._sock.settimeout(timeout)
+        self._sock.sendall((json.dumps(payload) + "\n").encode())
+        return self._read_response()
+
+    def close(self):
+        # Closing stdin ends the server's read loop
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _child_pids(pid: int) -> List[int]:
+    """Direct children of a process, from /proc."""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # "pid (comm) state ppid ..."; comm may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+class LocalEvalWorker:
+    """Client for one `eval_server.py` subprocess of a LocalSandboxRunner.
+
+    Same JSON-lines protocol and interface as `EvalWorker`, over the
+    process's stdin/stdout pipes.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        cwd: str,
+        env: Dict[str, str],
+        on_start: Optional[Callable[[int], None]] = None,
+        timeout: Optional[float] = None,
+    ):
+        # Strategy output goes to stderr; a file can't fill up and block it
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            # Own process group, so close() also reaps the server's forks
+            start_new_session=True,
+        )
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._process.stdout, selectors.EVENT_READ)
+        self._buffer = b""
+        self._timeout = timeout
+        if on_start:
+            try:
+                on_start(self._process.pid)
+            except BaseException:
+                self.close()
+                raise
+
+        ready = self._read_response()
+        if ready.get("status") != "ready":
+            raise RuntimeError(f"Evaluation server failed to start: {ready}")
+
+    @property
+    def stderr(self) -> bytes:
+        self._stderr.seek(0)
+        return self._stderr.read()[-65536:]
+
+    def _read_response(self) -> Dict[str, Any]:
+        while b"\n" not in self._buffer:
+            if not self._selector.select(self._timeout):
+                raise socket.timeout("Evaluation server did not answer")
+            chunk = self._process.stdout.read1(65536)
+            if not chunk:
+                raise EOFError(
+                    f"Evaluation server exited: {self.stderr.decode(errors='replace')}"
+                )
+            self._buffer += chunk
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def request(
+        self, payload: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send one request and wait up to `timeout` seconds for its response.
+
+        Raises `socket.timeout` when the server doesn't answer in time; the
+        worker must then be closed.
+        """
+        self._timeout = timeout
+        self._process.stdin.write((json.dumps(payload) + "\n").encode())
+        self._process.stdin.flush()
+        return self._read_response()
+
+    def close(self):
+        # Closing stdin ends the server's read loop; a stuck one is killed
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        # Budgeted evaluations run in groups of their own (limits.py); kill
+        # them while they are still the server's children
+        for pgid in _child_pids(self._process.pid) + [self._process.pid]:
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except OSError:
+                pass
+        self._process.wait()
+        self._selector.close()
+        self._stderr.close()
@@ -1,3 +1,4 @@
+from .resources import release
 from .state import GraphState
 
 
@@ -7,7 +8,8 @@ def finish(state: GraphState) -> GraphState:
 
     if len(state["solutions"][-1]) == 0:
         print("[Finish] No solutions found. Exiting.")
-        return state
+        release(state["run_id"])
+        return {}
 
     last_iteration = state["solutions"][-1]
 
@@ -23,16 +25,13 @@ def finish(state: GraphState) -> GraphState:
         f"[Finish] Best solution value: {(best_solution.get('result') if not best_solution.get('result') else {}).get('final_value', 0)}"
     )
 
-    # Best solution result
+    # Best solution result; the full code and metrics are in the artifact store
     print(best_solution.get("result"))
+    print(
+        f"[Finish] Best solution artifacts: code {best_solution.get('code_id')}, "
+        f"result {best_solution.get('result_id')}"
+    )
 
-    runner = state["runner"]
-    if runner:
-        try:
-            runner.stop()
-        except Exception as e:
-            print(f"Error stopping Docker runner: {e}")
+    release(state["run_id"])
 
-    return {
-        **state,
-    }
+    return {}
@@ -1,29 +1,93 @@
-from typing import Dict, Any
+import threading
+from typing import Any, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from .state import GraphState, Solution
-import json
 
+from langchain_core.runnables import RunnableConfig
+
+from .artifacts import get_artifact_store, summarize_result
+from .resources import get_client, get_runner
+from .state import GraphState, Solution
+from .container.cache import get_result_cache
+from .container.validate import validate_strategy
+from ..other.configuration import Configuration
+from ..other.edits import PatchError, apply_edits, parse_edits
+from ..other.llm import UsageStats, create_message, strip_code_fence
+from ..other.prompts import describe_market
 
 improve_strategy_code_prompt = """
-You are a professional quantitative engineer. Your objective is to enhance an existing trading strategy for the QQQ ETF using 15-minute bar data, with a specific focus on **maximizing the Sharpe Ratio**.
+You are a professional quantitative engineer. Your objective is to enhance an existing trading strategy for {market} using 15-minute bar data, with a specific focus on **maximizing the Sharpe Ratio**.
 
 Based on the **Strategy Description** and the **Improvement to Apply**, generate updated code using the template provided. You must strictly follow the coding structure and only use the allowed libraries.
 
 ⚠️ **Important Instructions:**
 - Only return **code**. Do **not** include any explanations, comments outside the template, or formatting beyond Python code.
 - Follow the given **code template** structure.
-- Use only the following libraries: `backtrader`, `pandas`, `numpy`, and standard Python libraries.
+- Use only the following libraries: `backtrader`, `pandas`, `numpy`, `indicators`, and standard Python libraries.
 
 !!! Return the python code in a single code block with no additional text or formatting.
 ---
 """
 
+improve_strategy_patch_prompt = """
+You are a professional quantitative engineer. Your objective is to enhance an existing trading strategy for {market} using 15-minute bar data, with a specific focus on **maximizing the Sharpe Ratio**.
+
+Based on the **Strategy Description** and the **Improvement to Apply**, edit the **Previous Code**.
+"""
+
+repair_strategy_prompt = """
+You are a professional quantitative engineer. A trading strategy for {market} using 15-minute bar data failed to validate or raised an error while it was backtested.
+
+Make the **smallest change** to the **Failing Code** that fixes the **Error**. Do not change the strategy's logic or parameters beyond what the fix requires.
+"""
+
+edit_format_prompt = """
+Return only the changes, as one or more edit blocks in this exact format:
+
+<<<<<<< SEARCH
+lines copied exactly from the code
+=======
+the lines that replace them
+>>>>>>> REPLACE
+
+⚠️ **Important Instructions:**
+- Only return **edit blocks**. Do **not** include any explanations or code fences.
+- Each SEARCH section must match the code exactly, including indentation, and only in one place. Add neighbouring lines if needed to make it unique.
+- Keep edits small: copy only the lines that change, plus the context that makes them unique.
+- To add code, search for the line it should follow and repeat that line at the start of the replacement.
+- The edited code must still follow the code template and use only `backtrader`, `pandas`, `numpy`, `indicators`, and standard Python libraries.
+---
+"""
+
 code_template_prompt = """
 ## Code Template
 
-- You can only use libraries `backtrader`, `pandas`, `numpy`, or libraries built-in in Python.
+- You can only use libraries `backtrader`, `pandas`, `numpy`, `indicators`, or libraries built-in in Python.
 - The class must be named `MyStrategy`.
 - The `__init__` method should not have any input parameters.
+- Optionally add a `signals(data, params)` staticmethod that returns, for every bar of the `data` DataFrame (lowercase `open`, `high`, `low`, `close`, `volume` columns), the target exposure from -1.0 (fully short) to 1.0 (fully long), computed with vectorized `pandas`/`numpy` operations. `params` is a dict of the strategy `params`. It must not look ahead: the value for a bar may only use that bar and earlier ones.
+
+## Rolling Windows
+Never rebuild a window of past values on every bar (no `list.pop(0)`, no `np.mean`, `np.percentile` or `np.sort` over a history list inside `next`). Use backtrader indicators, or the incremental helpers in the `indicators` module, which are updated once per bar and return the current value:
+- `RingBuffer(size)`: `.append(x)`, `buf[0]` oldest, `buf[-1]` newest, `.full`, `.values()`
+- `RollingMean(window)`, `RollingStd(window, ddof=0)`: `.update(x)` returns the mean / standard deviation
+- `RollingPercentile(window)`: `.update(x)` returns the median, `.percentile(q)` with q in 0-100, `.rank(x)` the fraction of the window <= x
+- `OrderFlowImbalance(window)`: `.update(open, high, low, close, volume)` returns the buy-minus-sell share of volume in [-1, 1]
+Every helper has `.ready`, true once its window is full.
+
+```python
+from indicators import RollingMean, RollingPercentile
+
+    def __init__(self):
+        self.volume_mean = RollingMean(20)
+        self.volume_pct = RollingPercentile(100)
+
+    def next(self):
+        volume = self.data.volume[0]
+        mean = self.volume_mean.update(volume)
+        self.volume_pct.update(volume)
+        if self.volume_pct.ready and self.volume_pct.rank(volume) > 0.9:
+            ...
+```
 
 ## Data Structure
 Datetime,Open,High,Low,Close,Volume,StockName
@@ -72,55 +136,315 @@ class MyStrategy(bt.Strategy):
 """
 
 
+# Tracebacks sent back for repair keep their end, where the error is
+MAX_REPAIR_ERROR = 4000
+
+
+class EvaluationLimitError(Exception):
+    """A backtest ran past its time or memory budget"""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class StrategyRuntimeError(Exception):
+    """A strategy raised while it was evaluated"""
+
+    def __init__(self, error: str):
+        super().__init__(error)
+        self.error = error
+
+    @property
+    def error_summary(self) -> str:
+        """The last line of the traceback"""
+        lines = self.error.strip().splitlines()
+        return lines[-1] if lines else ""
+
+    def trimmed(self, filename: str) -> str:
+        """The traceback cut down to the frames in `filename` and the
+        exception, which is all a repair needs; backtrader and evaluation
+        frames only cost prompt tokens"""
+        if "Traceback" not in self.error:
+            return self.error
+        kept = []
+        in_file = False
+        for line in self.error.strip().splitlines():
+            if line.startswith("  File "):
+                in_file = f'"{filename}"' in line or f'/{filename}"' in line
+            elif not line.startswith("    "):
+                # Headers and exceptions, of each chained traceback
+                in_file = True
+            if in_file:
+                kept.append(line)
+        return "\n".join(kept)
+
+
 class SolutionImplementer:
     """Handles individual solution processing"""
 
     def __init__(
         self,
         state: GraphState,
+        configurable: Configuration,
     ):
         self.stock_symbol = state["stock_symbol"]
-        self.runner = state["runner"]
-        self.anthropic_client = state["anthropic_client"]
+        self.symbols = configurable.evaluation_symbols(self.stock_symbol)
+        self.runner = get_runner(state["run_id"], configurable, self.symbols)
+        self.anthropic_client = get_client(state["run_id"], configurable)
         self.timestamp = state["timestamp"]
 
+        # Everything besides the code that changes an evaluation's result
+        self.eval_options = {
+            "engine": configurable.backtest_engine,
+            "cash": configurable.broker_cash,
+            "commission": configurable.broker_commission,
+            "profile": configurable.profile_strategies,
+        }
+        if configurable.walk_forward_folds > 1:
+            self.eval_options["folds"] = configurable.walk_forward_folds
+        if len(self.symbols) > 1:
+            self.eval_options["symbols"] = self.symbols
+        else:
+            self.eval_options["symbol"] = self.symbols[0]
+        # Budgets enforced by the sandbox; not part of the cache key
+        self.eval_limits = {
+            "timeout": configurable.eval_timeout,
+            "cpu_seconds": configurable.eval_cpu_seconds,
+            "max_rss_mb": configurable.eval_max_rss_mb,
+        }
+        self.result_cache = get_result_cache(
+            configurable.result_cache_dir, configurable.result_cache_max_mb << 20
+        )
+        self.artifacts = get_artifact_store(configurable.artifact_dir)
+
+        # Instructions and template are the same for every strategy of a run,
+        # so they go first and are sent as a cached prefix
+        market = describe_market(self.symbols)
+        self.prompt_prefix = (
+            improve_strategy_code_prompt.format(market=market) + code_template_prompt
+        )
+        self.patch_prompt_prefix = (
+            improve_strategy_patch_prompt.format(market=market)
+            + edit_format_prompt
+            + code_template_prompt
+        )
+        self.repair_prompt_prefix = (
+            repair_strategy_prompt.format(market=market)
+            + edit_format_prompt
+            + code_template_prompt
+        )
+        self.max_repair_attempts = configurable.max_repair_attempts
+        self.patch_refinement = configurable.patch_refinement
+        self.llm_usage = UsageStats()
+        self._patch_lock = threading.Lock()
+        self.patch_stats = {"applied": 0, "failed": 0}
+        # LLM calls made for the strategy being processed on this thread
+        self._calls = threading.local()
+        self._strategy_lock = threading.Lock()
+        self._strategy_stats = {
+            "succeeded": 0,
+            "failed": 0,
+            "repaired": 0,
+            "llm_calls": 0,
+        }
+        # Set once the caller stops waiting for results (the stream deadline);
+        # strategies still in flight give up at their next stage
+        self.cancelled = threading.Event()
+
+        # Early stopping compares every run against the best complete one so
+        # far, starting from the best of the previous generation
+        self.early_stop_rules = None
+        if configurable.early_stop:
+            self.early_stop_rules = {
+                "max_drawdown": configurable.early_stop_max_drawdown,
+                "no_trade_bars": configurable.early_stop_no_trade_bars,
+                "benchmark_ratio": configurable.early_stop_behind_best,
+            }
+        self._best_lock = threading.Lock()
+        self._best_value = None
+        self._best_checkpoints = []
+        if self.early_stop_rules:
+            for solution in state["solutions"][-1] if state["solutions"] else []:
+                # The checkpoints are only in the full result
+                self._update_best(
+                    self.artifacts.get_json(solution.get("pre_result_id"))
+                )
+
+    def _update_best(self, metrics: Dict[str, Any]):
+        """Keep the equity checkpoints of the best complete run"""
+        if metrics.get("partial") or not metrics.get("checkpoints"):
+            return
+        with self._best_lock:
+            if self._best_value is None or metrics["final_value"] > self._best_value:
+                self._best_value = metrics["final_value"]
+                self._best_checkpoints = metrics["checkpoints"]
+
+    def _with_artifacts(
+        self, solution: Solution, code: str, result: Dict[str, Any]
+    ) -> Solution:
+        """The solution with its code and full result moved to the artifact
+        store, keeping only summary metrics inline"""
+        return {
+            **solution,
+            "code_id": self.artifacts.put_text(code),
+            "result_id": self.artifacts.put_json(result) if result else None,
+            "result": summarize_result(result),
+        }
+
     def process_solution(self, solution: Solution) -> Solution:
+        """Process a single solution, counting the LLM calls it took"""
+        self._calls.count = 0
+        self._calls.repairs = 0
+        result = self._process_solution(solution)
+        if self.cancelled.is_set():
+            # Dropped by the caller, neither a success nor a failure
+            return result
+
+        succeeded = bool(
+            result
+            and result.get("result")
+            and result["result"].get("status", "ok") == "ok"
+        )
+        with self._strategy_lock:
+            if succeeded:
+                self._strategy_stats["succeeded"] += 1
+                self._strategy_stats["llm_calls"] += self._calls.count
+                if self._calls.repairs:
+                    self._strategy_stats["repaired"] += 1
+            else:
+                self._strategy_stats["failed"] += 1
+        return result
+
+    def strategy_stats(self) -> Dict[str, Any]:
+        """Outcomes so far, and LLM calls per strategy that evaluated"""
+        with self._strategy_lock:
+            stats = dict(self._strategy_stats)
+        stats["llm_calls_per_success"] = (
+            stats["llm_calls"] / stats["succeeded"] if stats["succeeded"] else None
+        )
+        return stats
+
+    def cancel(self):
+        """Stop strategies in flight at their next stage, releasing any
+        sandbox they would have leased"""
+        self.cancelled.set()
+
+    def _is_cancelled(self, solution_id) -> bool:
+        if not self.cancelled.is_set():
+            return False
+        print(f"⏰ [Implement] strategy-{solution_id}: cancelled")
+        return True
+
+    def _create_message(self, prompt: str, cached_prefix: str) -> str:
+        self._calls.count = getattr(self._calls, "count", 0) + 1
+        return create_message(
+            self.anthropic_client,
+            prompt,
+            cached_prefix=cached_prefix,
+            usage=self.llm_usage,
+        )
+
+    def _process_solution(self, solution: Solution) -> Solution:
         """Process a single solution through implement -> verify -> eval cycle"""
         solution_id = solution["solution_id"]
         retry_count = 0
         max_retries = 5
+        # Code that blows its budget tends to do so again; regenerate it once
+        limit_failures = 0
+        max_limit_failures = 2
+        # Code that failed validation or raised, and the error, for a repair
+        failed_code, error = None, None
+        repairs = 0
 
         print(f"\n============= strategy-{solution['solution_id']} =============")
         while retry_count <= max_retries:
+            if self._is_cancelled(solution_id):
+                return {}
             try:
 
-                # Implement
-                implementation_result = self._implement_solution(solution)
+                # Implement, or fix the previous attempt if it only needs a
+                # small change
+                implementation_result = None
+                if failed_code and repairs < self.max_repair_attempts:
+                    repairs += 1
+                    implementation_result = self._repair_solution(
+                        solution, failed_code, error
+                    )
+                if implementation_result is None:
+                    repairs = 0
+                    implementation_result = self._implement_solution(solution)
+                failed_code, error = None, None
+                if self._is_cancelled(solution_id):
+                    return {}
 
                 # print(f"[Debug] Implementation Result: {implementation_result}")
 
-                # Compile
-                compile_passed = self._compile_solution(
-                    implementation_result, solution_id
+                # Reject broken code locally, before it costs a sandbox round-trip
+                problems = self._compile_solution(implementation_result, solution_id)
+                if problems:
+                    retry_count += 1
+                    if retry_count > max_retries:
+                        return self._with_artifacts(solution, implementation_result, {})
+                    failed_code, error = implementation_result, "\n".join(problems)
+                    continue
+
+                # Code evaluated before with the same data and settings skips
+                # the sandbox entirely
+                cache_key = self.result_cache.key(
+                    implementation_result,
+                    self.runner.fingerprint(),
+                    **self.eval_options,
+                )
+                cached_result = self.result_cache.get(cache_key)
+                if cached_result is not None:
+                    # Entries written before series moved to the artifact
+                    # store point into a deleted workdir
+                    cached_result.pop("series_path", None)
+                    print(f"✅ [Evaluate] strategy-{solution_id}: cached result")
+                    return self._with_artifacts(
+                        solution, implementation_result, cached_result
+                    )
+
+                # Upload and evaluate on a sandbox leased for just this step,
+                # so LLM calls don't hold a container
+                with self.runner.lease() as runner:
+                    # The lease may have been a long wait
+                    if self._is_cancelled(solution_id):
+                        return {}
+                    self._upload_solution(runner, implementation_result, solution_id)
+                    evaluation_result = self._eval_solution(runner, solution_id)
+
+                # A run cut short depends on the benchmark at the time
+                if not evaluation_result.get("partial"):
+                    self.result_cache.put(cache_key, evaluation_result)
+                self._update_best(evaluation_result)
+                return self._with_artifacts(
+                    solution, implementation_result, evaluation_result
                 )
 
-                if compile_passed:
-                    # Evaluate
-                    evaluation_result = self._eval_solution(solution_id)
+            except EvaluationLimitError as e:
+                print(f"⏰ [Evaluate] strategy-{solution_id}: {e.status}, {e}")
+                limit_failures += 1
+                retry_count += 1
+                if limit_failures >= max_limit_failures or retry_count > max_retries:
+                    return self._with_artifacts(
+                        solution,
+                        implementation_result,
+                        {"status": e.status, "error": str(e)},
+                    )
 
-                    return {
-                        **solution,
-                        "code": implementation_result,
-                        "result": evaluation_result,
-                    }
-                else:
-                    retry_count += 1
-                    if retry_count > max_retries:
-                        return {
-                            **solution,
-                            "code": implementation_result,
-                            "result": {},
-                        }
+            except StrategyRuntimeError as e:
+                print(f"❌ [Evaluate] strategy-{solution_id}: {e.error_summary}")
+                retry_count += 1
+                if retry_count > max_retries:
+                    return self._with_artifacts(
+                        solution,
+                        implementation_result,
+                        {"status": "error", "error": e.error},
+                    )
+                failed_code = implementation_result
+                error = e.trimmed(f"strategies/strategy-{solution_id}.py")
 
             except Exception as e:
                 print(f"❌ [Error] Processing strategy-{solution_id}")
@@ -133,113 +457,142 @@ class SolutionImplementer:
         print(f"\n[Implement]", f"strategy-{solution['solution_id']}")
         # print(f"[Debug]\n", solution)
 
-        prompt = improve_strategy_code_prompt
+        prompt = "---\n\n"
         if solution.get("description"):
             prompt += f"## Strategy Description\n{solution['description']}\n\n"
         if solution.get("improvement"):
             prompt += f"## Improvement to Apply\n{solution['improvement']}\n\n"
-        if solution.get("pre_code"):
-            prompt += (
-                f"## Previous Code\n```python\n{solution['pre_code']}\n```\n\n"
-            )
-        prompt += code_template_prompt
+        pre_code = self.artifacts.get_text(solution.get("pre_code_id"))
+        if pre_code:
+            prompt += f"## Previous Code\n```python\n{pre_code}\n```\n\n"
 
         # print(f"[Debug][Implement] Prompt for LLM: {prompt}")
 
-        response = self.anthropic_client.messages.create(
-            model="claude-opus-4-20250514",
-            max_tokens=8192,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        # print(f"[Debug][Implement] Response from LLM: {response}")
-
-        if not response or not response.content:
-            raise ValueError("No response from LLM or empty content")
-
-        implementation_code = response.content[0].text.strip()
-        # remove ```json and ``` from the output
-        if implementation_code.startswith("```python"):
-            implementation_code = implementation_code[9:].strip()
-        if implementation_code.endswith("```"):
-            implementation_code = implementation_code[:-3].strip()
+        # Refinements ask for edits against the previous code, which is far
+        # less output than the whole file; a patch that doesn't apply falls
+        # back to a full regeneration
+        if pre_code and self.patch_refinement:
+            reply = self._create_message(prompt, self.patch_prompt_prefix)
+            try:
+                implementation_code = apply_edits(pre_code, parse_edits(reply))
+            except PatchError as e:
+                with self._patch_lock:
+                    self.patch_stats["failed"] += 1
+                print(
+                    f"⚠️ [Implement] strategy-{solution['solution_id']}: {e}, "
+                    "regenerating the whole file"
+                )
+            else:
+                with self._patch_lock:
+                    self.patch_stats["applied"] += 1
+                print(f"✅ [Implement] strategy-{solution['solution_id']} (patched)")
+                return implementation_code
 
-        implementation_code = implementation_code.strip()
+        implementation_code = self._create_message(prompt, self.prompt_prefix)
+        implementation_code = strip_code_fence(implementation_code, "python")
 
         print(f"✅ [Implement] strategy-{solution['solution_id']}")
 
         return implementation_code
 
-    def _compile_solution(self, implementation: str, solution_id) -> bool:
-        """Compile a single solution implementation"""
+    def _repair_solution(
+        self, solution: Solution, failed_code: str, error: str
+    ) -> Optional[str]:
+        """Ask for a minimal fix of code that failed; None when the fix
+        doesn't apply"""
+        print(f"\n[Repair]", f"strategy-{solution['solution_id']}")
+        prompt = (
+            "---\n\n"
+            f"## Failing Code\n```python\n{failed_code}\n```\n\n"
+            f"## Error\n```\n{error[-MAX_REPAIR_ERROR:]}\n```\n\n"
+        )
+        reply = self._create_message(prompt, self.repair_prompt_prefix)
+        try:
+            code = apply_edits(failed_code, parse_edits(reply))
+        except PatchError as e:
+            print(
+                f"⚠️ [Repair] strategy-{solution['solution_id']}: {e}, "
+                "regenerating the whole file"
+            )
+            return None
+        # Only fixes that applied make a strategy count as repaired
+        self._calls.repairs += 1
+        print(f"✅ [Repair] strategy-{solution['solution_id']}")
+        return code
+
+    def _compile_solution(self, implementation: str, solution_id) -> List[str]:
+        """Check a single solution implementation without running it; returns
+        the problems found"""
         print(f"[Compile] strategy-{solution_id}")
+        problems = validate_strategy(
+            implementation, f"strategies/strategy-{solution_id}.py"
+        )
+        if problems:
+            print(f"❌ [Compile Error] strategy-{solution_id}: {'; '.join(problems)}")
+            return problems
+        print(f"✅ [Compile] strategy-{solution_id}")
+        return []
+
+    def _upload_solution(self, runner, implementation: str, solution_id):
+        """Copy a compiled solution into the sandbox"""
         max_retries = 5
-        retry_count = 0
-        while retry_count < max_retries:
-            try:
-                result = self.runner.upload_file(
-                    implementation, f"strategies/strategy-{solution_id}.py"
-                )
-                if not result:
-                    raise ValueError("Failed to upload implementation code")
-
-                # compile the python code in the container
-                output = self.runner.run_command(
-                    f"python -m py_compile strategies/strategy-{solution_id}.py"
-                )
-                if "SyntaxError" in output or "IndentationError" in output:
-                    print(f"❌ [Compile Error] ", solution_id)
-                    return False
-                print(f"✅ [Compile] strategy-{solution_id}")
-                return True
-            except Exception as e:
-                retry_count += 1
-                if retry_count >= max_retries:
-                    print(
-                        f"Failed to compile solution {solution_id} after {max_retries} retries"
-                    )
-                    return False
-        return False
+        for retry_count in range(max_retries):
+            if runner.upload_file(
+                implementation, f"strategies/strategy-{solution_id}.py"
+            ):
+                return
+        raise ValueError(
+            f"Failed to upload strategy-{solution_id} after {max_retries} retries"
+        )
 
-    def _eval_solution(self, solution_id: str) -> Dict[str, Any]:
+    def _eval_solution(self, runner, solution_id: str) -> Dict[str, Any]:
         """Evaluate a single verified solution"""
         print(f"[Evaluate] strategy-{solution_id}")
 
-        res = self.runner.run_command(
-            f"python metrics.py --strategy-path strategies/strategy-{solution_id}.py --result-path logs/res-{solution_id}.json"
+        early_stop = None
+        if self.early_stop_rules:
+            with self._best_lock:
+                early_stop = {
+                    **self.early_stop_rules,
+                    "benchmark": self._best_checkpoints,
+                }
+
+        response = runner.evaluate(
+            f"strategies/strategy-{solution_id}.py",
+            **self.eval_options,
+            **self.eval_limits,
+            early_stop=early_stop,
+            # Actions and equity stay in a side file, loaded on demand
+            series_path=f"logs/series-{solution_id}.npz",
         )
+        if response.get("status") in ("timeout", "oom"):
+            raise EvaluationLimitError(response["status"], response.get("error", ""))
+        if response.get("status") != "ok":
+            raise StrategyRuntimeError(response.get("error") or "Evaluation failed")
 
-        print(f"✅ [Evaluate] strategy-{solution_id}: \n{res}\n")
-
-        # download the result file
-        result_content = self.runner.download_file(f"logs/res-{solution_id}.json")
-        if not result_content:
-            raise ValueError(f"Failed to download evaluation result for {solution_id}")
-
-        json_data = result_content.strip()
-        if not json_data:
-            raise ValueError(f"Evaluation result for {solution_id} is empty")
-
-        # Parse the JSON result
-        try:
-            evaluation_result = json.loads(json_data)
-        except json.JSONDecodeError as e:
-            raise ValueError(
-                f"Invalid JSON format in evaluation result for {solution_id}: {e}"
-            )
+        print(f"✅ [Evaluate] strategy-{solution_id}: \n{response['summary']}\n")
 
-        return evaluation_result
+        # The side file is in the runner's workdir, which is deleted when the
+        # run stops; results reference a copy in the artifact store instead
+        metrics = response["metrics"]
+        if response.get("series_path"):
+            with open(response["series_path"], "rb") as f:
+                metrics["series_id"] = self.artifacts.put(f.read())
+        return metrics
 
 
-def implement(state: GraphState) -> GraphState:
+def implement(state: GraphState, config: RunnableConfig) -> GraphState:
     """Process all solutions in parallel"""
     if not state["solutions"]:
         return state
 
-    processor = SolutionImplementer(state)
+    processor = SolutionImplementer(state, Configuration.from_runnable_config(config))
 
     # Process solutions in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=min(len(state["solutions"]), 5)) as executor:
+    # Enough threads to keep every sandbox in the pool busy
+    max_workers = max(5, getattr(processor.runner, "size", 1))
+    max_workers = max(1, min(len(state["solutions"][-1]), max_workers))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit all solutions for processing
         future_to_solution = {
             executor.submit(processor.process_solution, solution): (solution)
@@ -258,5 +611,11 @@ def implement(state: GraphState) -> GraphState:
             except Exception as e:
                 print(f"❌ [Implement Error] {e}")
                 continue
-    state["solutions"][-1] = updated_solutions
-    return {**state}
+    if hasattr(processor.runner, "stats"):
+        print(f"[Implement] Sandbox pool: {processor.runner.stats()}")
+    print(f"[Implement] Result cache: {processor.result_cache.stats()}")
+    print(f"[Implement] LLM usage: {processor.llm_usage.stats()}")
+    print(f"[Implement] Patches: {processor.patch_stats}")
+    print(f"[Implement] Strategies: {processor.strategy_stats()}")
+
+    return {"solutions": state["solutions"][:-1] + [updated_solutions]}
@@ -1,41 +1,43 @@
-import anthropic
 import datetime
+import uuid
 from dotenv import load_dotenv
-import os
 
-from ..state import GraphState
-from ..container import PersistentDockerRunner
+from langchain_core.runnables import RunnableConfig
 
+from ..state import GraphState
+from ..resources import get_client, get_runner, release
+from ...other.configuration import Configuration
 
 load_dotenv()
 
-if os.getenv("ANTHROPIC_API_KEY") is None:
-    raise ValueError("ANTHROPIC_API_KEY is not set")
-
 
-def initialize(state: GraphState) -> GraphState:
+def initialize(state: GraphState, config: RunnableConfig) -> GraphState:
     """Initialize the analysis process"""
-    try:
-        runner = PersistentDockerRunner()
-        runner.start()
-        runner.verify_uploaded_files()
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    configurable = Configuration.from_runnable_config(config)
 
-        anthropic_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        return {
-            "stock_symbol": state["stock_symbol"],
-            "runner": runner,
-            "timestamp": timestamp,
-            "think_count": 0,
-            # LLM Client
-            "anthropic_client": anthropic_client,
-            # Solution tracking
-            "solutions": [],
-            "processed_solutions": [],
-            "best_solution": 0,
-        }
-    except Exception as e:
-        print(f"Error starting Docker runner: {e}")
-        raise RuntimeError(
-            "Failed to initialize Docker runner. Ensure Docker is running and accessible."
+    # Live resources stay in the process-side registry; state only keeps the
+    # run id, so it can be checkpointed
+    run_id = uuid.uuid4().hex
+    try:
+        get_client(run_id, configurable)
+        get_runner(
+            run_id,
+            configurable,
+            configurable.evaluation_symbols(state["stock_symbol"]),
         )
+    except Exception:
+        release(run_id)
+        raise
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    return {
+        "stock_symbol": state["stock_symbol"],
+        "run_id": run_id,
+        "timestamp": timestamp,
+        "think_count": 0,
+        # Solution tracking
+        "solutions": [],
+        "history": None,
+        "processed_solutions": [],
+        "best_solution": 0,
+    }
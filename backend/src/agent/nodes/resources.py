@@ -0,0 +1,124 @@
+"""Live resources of a run, kept outside GraphState.
+
+The sandbox runner and the LLM client hold sockets, processes and threads,
+so they can't be checkpointed. GraphState only carries the run's `run_id`
+and nodes look the resources up here. When a run is resumed in a fresh
+process (e.g. from a persistent checkpointer after a crash) the registry is
+empty, and the resources are recreated from the run's configuration on
+first use.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Union
+
+import anthropic
+
+from .container import (
+    BACKENDS,
+    LocalSandboxRunner,
+    PersistentDockerRunner,
+    RunnerPool,
+    SandboxRunner,
+)
+from ..other.configuration import Configuration
+from ..other.stub_llm import StubAnthropic
+
+Runner = Union[SandboxRunner, RunnerPool]
+
+_lock = threading.Lock()
+_run_locks: Dict[str, threading.Lock] = {}
+_runners: Dict[str, Runner] = {}
+_clients: Dict[str, Any] = {}
+
+
+def _run_lock(run_id: str) -> threading.Lock:
+    # One lock per run, so starting a sandbox doesn't block other runs
+    with _lock:
+        return _run_locks.setdefault(run_id, threading.Lock())
+
+
+def create_runner(configurable: Configuration, symbols: Sequence[str] = ()) -> Runner:
+    """Start and verify the sandbox runner selected by the configuration,
+    with `symbols` loaded by its evaluation servers up front."""
+    if configurable.sandbox_backend not in BACKENDS:
+        raise ValueError(f"Unknown sandbox backend: {configurable.sandbox_backend}")
+
+    try:
+        if configurable.sandbox_pool_size > 1:
+            runner = RunnerPool(
+                configurable.sandbox_pool_size,
+                offline=configurable.sandbox_offline,
+                backend=configurable.sandbox_backend,
+                warm_symbols=symbols,
+            )
+        elif configurable.sandbox_backend == "local":
+            runner = LocalSandboxRunner(warm_symbols=symbols)
+        else:
+            runner = PersistentDockerRunner(
+                offline=configurable.sandbox_offline, warm_symbols=symbols
+            )
+        runner.start()
+        runner.verify_uploaded_files()
+        return runner
+    except Exception as e:
+        print(f"Error starting {configurable.sandbox_backend} runner: {e}")
+        if configurable.sandbox_backend == "local":
+            raise RuntimeError("Failed to initialize the local sandbox runner.") from e
+        raise RuntimeError(
+            "Failed to initialize Docker runner. Ensure Docker is running and accessible."
+        )
+
+
+def create_client(configurable: Configuration):
+    """The LLM client selected by the configuration."""
+    if configurable.llm_provider == "stub":
+        return StubAnthropic()
+    if os.getenv("ANTHROPIC_API_KEY") is None:
+        raise ValueError("ANTHROPIC_API_KEY is not set")
+    return anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+
+
+def register(run_id: str, runner: Optional[Runner] = None, client: Any = None):
+    """Use an existing runner and/or client for a run (benchmarks, tests)."""
+    with _run_lock(run_id):
+        if runner is not None:
+            _runners[run_id] = runner
+        if client is not None:
+            _clients[run_id] = client
+
+
+def get_runner(
+    run_id: str, configurable: Configuration, symbols: Sequence[str] = ()
+) -> Runner:
+    """The run's sandbox runner, started on first use (see `create_runner`)."""
+    with _run_lock(run_id):
+        runner = _runners.get(run_id)
+        if runner is None:
+            print(f"[Resources] Starting a sandbox for run {run_id}")
+            runner = _runners[run_id] = create_runner(configurable, symbols)
+        return runner
+
+
+def get_client(run_id: str, configurable: Configuration):
+    """The run's LLM client, created on first use."""
+    with _run_lock(run_id):
+        client = _clients.get(run_id)
+        if client is None:
+            client = _clients[run_id] = create_client(configurable)
+        return client
+
+
+def release(run_id: str):
+    """Stop the run's sandbox and forget its resources."""
+    with _run_lock(run_id):
+        runner = _runners.pop(run_id, None)
+        _clients.pop(run_id, None)
+    with _lock:
+        _run_locks.pop(run_id, None)
+
+    if runner:
+        try:
+            runner.stop()
+        except Exception as e:
+            print(f"Error stopping sandbox runner: {e}")
@@ -5,12 +5,9 @@ from langgraph.graph import add_messages
 from typing_extensions import Annotated
 import operator
 
-
 # ====================================== #
-from typing import TypedDict, List, Dict, Any, Annotated, Union
+from typing import TypedDict, List, Dict, Any, Annotated, Optional, Union
 import operator
-from .container.container import PersistentDockerRunner
-from anthropic import Anthropic
 
 
 class Solution(TypedDict):
@@ -18,26 +15,30 @@ class Solution(TypedDict):
     pre_description: str
     description: str
     improvement: str
-    pre_code: str
-    code: str
+    # Ids of the full source and metrics in the artifact store
+    # (nodes/artifacts.py); the results below are summary metrics only
+    pre_code_id: Optional[str]
+    code_id: Optional[str]
+    pre_result_id: Optional[str]
+    result_id: Optional[str]
     pre_result: Dict[str, Any]
     result: Dict
-    
 
 
 class GraphState(TypedDict):
     """Main state that flows through the graph"""
 
     stock_symbol: str
-    runner: Union[PersistentDockerRunner]
+    # Key of the run's sandbox runner and LLM client in nodes/resources.py;
+    # state holds only serializable data so runs can be checkpointed
+    run_id: str
     timestamp: str
     think_count: int
 
-    # LLM Client
-    anthropic_client: Anthropic
-
-    # Solution
+    # Solution: the current generation only, earlier ones are in the
+    # artifact store under the `history` chain
     solutions: List[List[Solution]]
+    history: Optional[str]
 
 
 # ====================================== #
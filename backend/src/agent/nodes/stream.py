@@ -0,0 +1,103 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from langchain_core.runnables import RunnableConfig
+
+from .resources import get_client
+from .state import GraphState
+from .think import think, refine_strategy
+from .implement import SolutionImplementer
+from ..other.configuration import Configuration
+from ..other.llm import UsageStats
+from ..other.prompts import describe_market
+
+
+def stream(state: GraphState, config: RunnableConfig) -> GraphState:
+    """Think and implement in one pass, starting each strategy as soon as its idea is ready"""
+    configurable = Configuration.from_runnable_config(config)
+    deadline = time.monotonic() + configurable.stream_deadline
+
+    first_generation = state["think_count"] == 0
+    if first_generation:
+        # All first ideas come from a single LLM call, there is nothing to overlap
+        state = {**state, **think(state, config)}
+
+    strategies = state["solutions"][-1]
+    order = {s["solution_id"]: index for index, s in enumerate(strategies)}
+    processor = SolutionImplementer(state, configurable)
+    anthropic_client = get_client(state["run_id"], configurable)
+    market = describe_market(configurable.evaluation_symbols(state["stock_symbol"]))
+    think_usage = UsageStats()
+
+    # Each strategy uses one thread at a time: refine, then implement
+    max_workers = max(
+        configurable.llm_concurrency, getattr(processor.runner, "size", 1)
+    )
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(strategies), max_workers)))
+
+    stage = {}
+    for strategy in strategies:
+        if first_generation:
+            future = executor.submit(processor.process_solution, strategy)
+            stage[future] = ("implement", strategy)
+        else:
+            future = executor.submit(
+                refine_strategy,
+                anthropic_client,
+                strategy,
+                configurable,
+                market,
+                think_usage,
+            )
+            stage[future] = ("think", strategy)
+
+    completed = []
+    pending = set(stage)
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            kind, strategy = stage.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ [Stream Error] strategy-{strategy['solution_id']}: {e}")
+                continue
+
+            if kind == "think":
+                # Idea ready: go straight to implement -> compile -> evaluate
+                refined = {
+                    **strategy,
+                    "description": result.get("description"),
+                    "improvement": result.get("improvement"),
+                }
+                future = executor.submit(processor.process_solution, refined)
+                stage[future] = ("implement", refined)
+                pending.add(future)
+            elif result:
+                print(f"✅ [Stream] strategy-{result['solution_id']} finished")
+                completed.append(result)
+
+    if pending:
+        late = sorted(strategy["solution_id"] for _, strategy in stage.values())
+        print(f"⏰ [Stream] Deadline reached, dropping strategies: {late}")
+    # Don't wait for stragglers; queued ones never start, and running ones
+    # stop at their next stage and give back their sandbox
+    processor.cancel()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"[Stream] Result cache: {processor.result_cache.stats()}")
+    if not first_generation:
+        print(f"[Stream] Think LLM usage: {think_usage.stats()}")
+    print(f"[Stream] Implement LLM usage: {processor.llm_usage.stats()}")
+    print(f"[Stream] Patches: {processor.patch_stats}")
+    print(f"[Stream] Strategies: {processor.strategy_stats()}")
+
+    completed.sort(key=lambda s: order[s["solution_id"]])
+    return {
+        "think_count": state["think_count"] + (0 if first_generation else 1),
+        "solutions": state["solutions"][:-1] + [completed],
+    }
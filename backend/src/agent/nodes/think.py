@@ -1,8 +1,23 @@
-from .state import GraphState
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from .artifacts import get_artifact_store
+from .resources import get_client
+from .state import GraphState, Solution
+from ..other.configuration import Configuration
+from ..other.llm import (
+    UsageStats,
+    call_with_retry,
+    create_message,
+    strip_code_fence,
+)
+from ..other.prompts import describe_market
 import json
 
 initial_prompt = """
-You are a professional quantitative engineer. Your task is to develop innovative trading strategies for the QQQ ETF using 15-minute bar data. Your primary objective is to maximize the Sharpe Ratio.
+You are a professional quantitative engineer. Your task is to develop innovative trading strategies for {market} using 15-minute bar data. Your primary objective is to maximize the Sharpe Ratio.
 
 Please draw on your full expertise and knowledge—be bold, creative, and avoid conventional or overly simplistic ideas. I want **four distinct and imaginative strategy directions** that go beyond the basics.
 
@@ -41,7 +56,7 @@ This version:
 
 
 improve_strategy_prompt = """
-You are a professional quantitative engineer. Your objective is to enhance an existing trading strategy for the QQQ ETF using 15-minute bar data, with a specific focus on **maximizing the Sharpe Ratio**.
+You are a professional quantitative engineer. Your objective is to enhance an existing trading strategy for {market} using 15-minute bar data, with a specific focus on **maximizing the Sharpe Ratio**.
 
 Your task is to **critically evaluate** the provided strategy and identify **concrete areas for improvement**. Use your expertise to suggest refined or alternative components—such as entry/exit logic, technical indicators, filters, risk management, or position sizing—that can measurably improve performance.
 
@@ -69,7 +84,11 @@ Just return the output in JSON format with the following structure:
 
 You will be given the previous strategy, its implementation, and the resulting performance metrics.
 
-### Previous Strategy
+"""
+
+# The part of the refinement prompt that changes with every strategy; it
+# follows improve_strategy_prompt, which is sent as a cached prefix
+previous_strategy_prompt = """### Previous Strategy
 {description}
 
 ### Previous Code
@@ -79,15 +98,61 @@ You will be given the previous strategy, its implementation, and the resulting p
 {result}
 
 ---
-
-
 """
 
 
-def think(state: GraphState) -> GraphState:
+def refine_strategy(
+    anthropic_client,
+    old_strategy: Solution,
+    configurable: Configuration,
+    market: str,
+    usage: Optional[UsageStats] = None,
+) -> Dict[str, Any]:
+    """Ask the LLM for an improved description of one previous strategy"""
+    artifacts = get_artifact_store(configurable.artifact_dir)
+    prompt = previous_strategy_prompt.format(
+        description=old_strategy.get("pre_description", ""),
+        code=artifacts.get_text(old_strategy.get("pre_code_id")),
+        result=artifacts.get_json(old_strategy.get("pre_result_id"))
+        or old_strategy.get("pre_result", ""),
+    )
+
+    def attempt() -> Dict[str, Any]:
+        solution_string = create_message(
+            anthropic_client,
+            prompt,
+            timeout=configurable.llm_timeout,
+            cached_prefix=improve_strategy_prompt.format(market=market),
+            usage=usage,
+        )
+        response = json.loads(strip_code_fence(solution_string, "json"))
+
+        if (
+            not isinstance(response, dict)
+            or "description" not in response
+            or "improvement" not in response
+        ):
+            raise ValueError("Invalid response format")
+        return response
+
+    try:
+        return call_with_retry(
+            attempt,
+            max_retries=configurable.llm_max_retries,
+            label=f"[Think] strategy-{old_strategy.get('solution_id')}",
+        )
+    except Exception as e:
+        raise ValueError(
+            "Failed to generate updated strategy after multiple retries"
+        ) from e
+
+
+def think(state: GraphState, config: RunnableConfig) -> GraphState:
     """Generate multiple solutions for stock analysis"""
 
-    anthropic_client = state["anthropic_client"]
+    configurable = Configuration.from_runnable_config(config)
+    anthropic_client = get_client(state["run_id"], configurable)
+    market = describe_market(configurable.evaluation_symbols(state["stock_symbol"]))
 
     max_retries = 3  # Maximum number of retries for LLM calls
     retry_count = 0
@@ -99,7 +164,12 @@ def think(state: GraphState) -> GraphState:
                 message = anthropic_client.messages.create(
                     model="claude-opus-4-20250514",
                     max_tokens=8192,
-                    messages=[{"role": "user", "content": initial_prompt}],
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": initial_prompt.format(market=market),
+                        }
+                    ],
                 )
                 solution_string = message.content[0].text.strip()
                 # remove ```json and ``` from the output
@@ -129,8 +199,10 @@ def think(state: GraphState) -> GraphState:
                     "solution_id": f"{state['think_count']+1}_{index+1}",
                     "description": solution.strip(),
                     "pre_description": "",
-                    "code": "",
-                    "pre_code": "",
+                    "code_id": None,
+                    "pre_code_id": None,
+                    "result_id": None,
+                    "pre_result_id": None,
                     "result": {},
                     "pre_result": {},
                     "improvement": "",
@@ -138,73 +210,38 @@ def think(state: GraphState) -> GraphState:
             )
 
         return {
-            **state,
             "think_count": state["think_count"] + 1,
             "solutions": previous_solutions + [new_solutions],
         }
     else:
         previous_strategies = state["solutions"][-1]
-        updated_strategies = []
-        for index, old_strategy in enumerate(previous_strategies):
-            finished = False
-
-            max_retries = 5  # Maximum number of retries for LLM calls
-            retry_count = 0
-
-            while not finished and retry_count < max_retries:
-                try:
-                    prompt = improve_strategy_prompt.format(
-                        description=old_strategy.get("pre_description", ""),
-                        code=old_strategy.get("pre_code", ""),
-                        result=old_strategy.get("pre_result", ""),
-                    )
-                    message = anthropic_client.messages.create(
-                        model="claude-opus-4-20250514",
-                        max_tokens=8192,
-                        messages=[{"role": "user", "content": prompt}],
-                    )
-
-                    solution_string = message.content[0].text.strip()
-
-                    # remove ```json and ``` from the output
-                    if solution_string.startswith("```json"):
-                        solution_string = solution_string[7:].strip()
-                    if solution_string.endswith("```"):
-                        solution_string = solution_string[:-3].strip()
-
-                    # print(f"[Debug][Think] Prompt for LLM: {solution_string}")
-
-                    # print(f"[Debug] \n{solution_string.strip()}\n")
-                    response = json.loads(solution_string.strip())
-                    # print(f"[Debug] Response from LLM: {response}")
-
-                    if (
-                        not isinstance(response, dict)
-                        or "description" not in response
-                        or "improvement" not in response
-                    ):
-                        raise ValueError("Invalid response format")
-
-                    old_strategy["description"] = response.get("description")
-                    old_strategy["improvement"] = response.get("improvement")
-                    updated_strategies.append(old_strategy)
-
-                    finished = True  # Exit loop if successful
-                except Exception as e:
-                    # retry on any error
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        raise ValueError(
-                            "Failed to generate updated strategy after multiple retries"
-                        ) from e
-                    print(f"❌ [Think] Error generating solutions: {e}")
-                    continue
+        usage = UsageStats()
+
+        # Refine every strategy concurrently; map() keeps the input order
+        max_workers = max(
+            1, min(len(previous_strategies), configurable.llm_concurrency)
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(
+                executor.map(
+                    lambda old_strategy: refine_strategy(
+                        anthropic_client, old_strategy, configurable, market, usage
+                    ),
+                    previous_strategies,
+                )
+            )
+        print(f"[Think] LLM usage: {usage.stats()}")
 
-        previous_solutions = state["solutions"]
-        previous_solutions[-1] = updated_strategies
+        updated_strategies = [
+            {
+                **old_strategy,
+                "description": response.get("description"),
+                "improvement": response.get("improvement"),
+            }
+            for old_strategy, response in zip(previous_strategies, responses)
+        ]
 
         return {
-            **state,
             "think_count": state["think_count"] + 1,
-            "solutions": previous_solutions,
+            "solutions": state["solutions"][:-1] + [updated_strategies],
         }
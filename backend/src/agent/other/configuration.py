@@ -1,6 +1,6 @@
 import os
 from pydantic import BaseModel, Field
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from langchain_core.runnables import RunnableConfig
 
@@ -39,6 +39,199 @@ class Configuration(BaseModel):
         metadata={"description": "The maximum number of research loops to perform."},
     )
 
+    sandbox_pool_size: int = Field(
+        default=1,
+        metadata={
+            "description": "The number of sandbox containers evaluating strategies in parallel."
+        },
+    )
+
+    sandbox_backend: str = Field(
+        default="docker",
+        metadata={
+            "description": "Where strategies run: 'docker' containers, or 'local' subprocesses of this interpreter for CI and benchmarks without Docker (weaker isolation)."
+        },
+    )
+
+    sandbox_offline: bool = Field(
+        default=False,
+        metadata={
+            "description": "Fail fast instead of building when the sandbox image is not cached."
+        },
+    )
+
+    llm_provider: str = Field(
+        default="anthropic",
+        metadata={
+            "description": "The LLM client to use: 'anthropic', or 'stub' for offline runs and benchmarks."
+        },
+    )
+
+    llm_concurrency: int = Field(
+        default=4,
+        metadata={
+            "description": "The maximum number of concurrent LLM calls per node."
+        },
+    )
+
+    llm_timeout: float = Field(
+        default=600.0,
+        metadata={"description": "The timeout in seconds for a single LLM call."},
+    )
+
+    llm_max_retries: int = Field(
+        default=5,
+        metadata={"description": "The maximum number of attempts per LLM call."},
+    )
+
+    patch_refinement: bool = Field(
+        default=True,
+        metadata={
+            "description": "Ask for search/replace edits against the previous code instead of a whole new file when refining a strategy; falls back to a full file when the edits don't apply."
+        },
+    )
+
+    max_repair_attempts: int = Field(
+        default=3,
+        metadata={
+            "description": "Consecutive requests for a minimal fix of strategy code that failed validation or raised during evaluation, before it is regenerated from scratch; 0 always regenerates."
+        },
+    )
+
+    streaming: bool = Field(
+        default=False,
+        metadata={
+            "description": "Implement each refined strategy as soon as its idea is ready instead of waiting for the whole generation."
+        },
+    )
+
+    stream_deadline: float = Field(
+        default=3600.0,
+        metadata={
+            "description": "Seconds a streaming generation may run before unfinished strategies are dropped."
+        },
+    )
+
+    broker_cash: float = Field(
+        default=100000.0,
+        metadata={"description": "The starting cash of every backtest."},
+    )
+
+    broker_commission: float = Field(
+        default=0.001,
+        metadata={"description": "The commission rate charged on every order."},
+    )
+
+    backtest_engine: str = Field(
+        default="backtrader",
+        metadata={
+            "description": "The backtest engine: 'backtrader', or 'vector' for strategies with signals()."
+        },
+    )
+
+    result_cache_dir: str = Field(
+        default="~/.cache/invest-agent/results",
+        metadata={
+            "description": "The directory of the persistent backtest result cache."
+        },
+    )
+
+    result_cache_max_mb: int = Field(
+        default=256,
+        metadata={
+            "description": "The size limit of the backtest result cache in megabytes; 0 disables it."
+        },
+    )
+
+    artifact_dir: str = Field(
+        default="~/.cache/invest-agent/artifacts",
+        metadata={
+            "description": "The directory of the content-addressed store for strategy code, full results and generation history."
+        },
+    )
+
+    eval_timeout: float = Field(
+        default=600.0,
+        metadata={
+            "description": "The wall-clock budget in seconds of a single backtest; 0 disables it."
+        },
+    )
+
+    eval_cpu_seconds: float = Field(
+        default=600.0,
+        metadata={
+            "description": "The CPU-time budget in seconds of a single backtest; 0 disables it."
+        },
+    )
+
+    eval_max_rss_mb: int = Field(
+        default=4096,
+        metadata={
+            "description": "The resident memory cap in megabytes of a single backtest; 0 disables it."
+        },
+    )
+
+    profile_strategies: bool = Field(
+        default=False,
+        metadata={
+            "description": "Profile every backtest: next() latency, indicator/analyzer time and hot lines."
+        },
+    )
+
+    max_next_p90_ms: float = Field(
+        default=2.0,
+        metadata={
+            "description": "Profiled strategies whose 90th percentile next() latency exceeds this many milliseconds are dropped from the next generation."
+        },
+    )
+
+    early_stop: bool = Field(
+        default=False,
+        metadata={
+            "description": "Stop backtests of hopeless strategies partway through and record partial metrics."
+        },
+    )
+
+    early_stop_max_drawdown: float = Field(
+        default=0.5,
+        metadata={
+            "description": "Stop a backtest once its drawdown from the equity peak exceeds this fraction."
+        },
+    )
+
+    early_stop_behind_best: float = Field(
+        default=0.7,
+        metadata={
+            "description": "Stop a backtest whose equity falls below this fraction of the generation's best at the same checkpoint."
+        },
+    )
+
+    early_stop_no_trade_bars: int = Field(
+        default=2000,
+        metadata={
+            "description": "Stop a backtest that has not traded after this many bars."
+        },
+    )
+
+    walk_forward_folds: int = Field(
+        default=0,
+        metadata={
+            "description": "Backtest on this many contiguous time slices in parallel and rank strategies on the last, out-of-sample one; 0 or 1 runs a single backtest."
+        },
+    )
+
+    watch_list: str = Field(
+        default="",
+        metadata={
+            "description": "Comma-separated symbols every strategy is scored on together; empty uses the graph's stock_symbol alone."
+        },
+    )
+
+    def evaluation_symbols(self, stock_symbol: str) -> List[str]:
+        """The symbols strategies are backtested on."""
+        symbols = [s.strip() for s in self.watch_list.split(",") if s.strip()]
+        return symbols or [stock_symbol]
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
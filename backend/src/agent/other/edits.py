@@ -0,0 +1,47 @@
+"""Search/replace edit blocks, the patch format for refining strategies.
+
+A reply holds one or more blocks, each replacing text that occurs exactly
+once in the previous code:
+
+    <<<<<<< SEARCH
+    lines copied from the previous code
+    =======
+    the lines that replace them
+    >>>>>>> REPLACE
+"""
+
+import re
+from typing import List, Tuple
+
+EDIT_BLOCK = re.compile(
+    r"^<<<<<<< SEARCH\n(.*?)^=======\n(.*?)^>>>>>>> REPLACE$",
+    re.MULTILINE | re.DOTALL,
+)
+
+
+class PatchError(ValueError):
+    """An edit list that can't be applied to the code"""
+
+
+def parse_edits(text: str) -> List[Tuple[str, str]]:
+    """The (search, replace) pairs of every edit block in `text`."""
+    edits = EDIT_BLOCK.findall(text)
+    if not edits:
+        raise PatchError("No edit blocks in the reply")
+    return edits
+
+
+def apply_edits(code: str, edits: List[Tuple[str, str]]) -> str:
+    """Apply edits in order; every search text must match exactly once."""
+    if not code.endswith("\n"):
+        code += "\n"
+    for index, (search, replace) in enumerate(edits, start=1):
+        if not search.strip():
+            raise PatchError(f"Edit {index} has an empty search section")
+        count = code.count(search)
+        if count != 1:
+            raise PatchError(
+                f"Edit {index} search text found {count} times, expected once"
+            )
+        code = code.replace(search, replace, 1)
+    return code
@@ -0,0 +1,144 @@
+import random
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+MODEL = "claude-opus-4-20250514"
+
+
+class UsageStats:
+    """Token usage and time to first token of a node's LLM calls.
+
+    A call counts as a cache hit when it read any input tokens from the
+    provider's prompt cache; the TTFT saved is the median first-token time
+    of misses minus that of hits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.output_tokens = 0
+        self._ttft = {True: [], False: []}
+
+    def record(self, usage, ttft: Optional[float]):
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += getattr(usage, "input_tokens", None) or 0
+            self.cache_read_tokens += cache_read
+            self.cache_write_tokens += (
+                getattr(usage, "cache_creation_input_tokens", None) or 0
+            )
+            self.output_tokens += getattr(usage, "output_tokens", None) or 0
+            if ttft is not None:
+                self._ttft[cache_read > 0].append(ttft)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            prompt_tokens = (
+                self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+            )
+            hits, misses = self._ttft[True], self._ttft[False]
+            ttft_hit = statistics.median(hits) if hits else None
+            ttft_miss = statistics.median(misses) if misses else None
+            return {
+                "calls": self.calls,
+                "cache_hits": len(hits),
+                "cache_hit_rate": (
+                    self.cache_read_tokens / prompt_tokens if prompt_tokens else 0.0
+                ),
+                "input_tokens": self.input_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_write_tokens": self.cache_write_tokens,
+                "output_tokens": self.output_tokens,
+                "ttft_hit_seconds": ttft_hit,
+                "ttft_miss_seconds": ttft_miss,
+                "ttft_saved_seconds": (
+                    ttft_miss - ttft_hit
+                    if ttft_hit is not None and ttft_miss is not None
+                    else None
+                ),
+            }
+
+
+def create_message(
+    client,
+    prompt: str,
+    max_tokens: int = 8192,
+    timeout: Optional[float] = None,
+    cached_prefix: Optional[str] = None,
+    usage: Optional[UsageStats] = None,
+) -> str:
+    """Send a single-turn prompt and return the text of the reply.
+
+    `cached_prefix` goes ahead of `prompt` in its own block, marked for the
+    provider's prompt cache; it is only reused while it stays byte-identical,
+    so everything that varies between calls belongs in `prompt`. The reply
+    is streamed to time its first token, and recorded in `usage` if given.
+    """
+    content = prompt
+    if cached_prefix:
+        content = [
+            {
+                "type": "text",
+                "text": cached_prefix,
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": prompt},
+        ]
+
+    started = time.perf_counter()
+    ttft = None
+    with client.messages.stream(
+        model=MODEL,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": content}],
+        timeout=timeout,
+    ) as stream:
+        for _ in stream.text_stream:
+            if ttft is None:
+                ttft = time.perf_counter() - started
+        message = stream.get_final_message()
+
+    if usage is not None:
+        usage.record(message.usage, ttft)
+    if not message or not message.content:
+        raise ValueError("No response from LLM or empty content")
+    return message.content[0].text.strip()
+
+
+def strip_code_fence(text: str, language: str) -> str:
+    """Remove a surrounding ```<language> ... ``` block from an LLM reply."""
+    text = text.strip()
+    if text.startswith(f"```{language}"):
+        text = text[len(language) + 3 :].strip()
+    if text.endswith("```"):
+        text = text[:-3].strip()
+    return text
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    max_retries: int,
+    label: str,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> T:
+    """Call `fn` until it succeeds, sleeping with full-jitter exponential backoff.
+
+    Raises the last error once `max_retries` attempts have failed.
+    """
+    for attempt in range(max_retries):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt + 1 >= max_retries:
+                raise
+            print(f"❌ {label} Error: {e}")
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2**attempt)))
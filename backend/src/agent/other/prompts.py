@@ -6,6 +6,16 @@ def get_current_date():
     return datetime.now().strftime("%B %d, %Y")
 
 
+# What strategies trade, for the strategy prompts
+def describe_market(symbols):
+    if len(symbols) == 1:
+        return symbols[0]
+    return (
+        f"a watch list of {', '.join(symbols)} (one strategy is scored on every "
+        "symbol separately and judged on the combined result)"
+    )
+
+
 query_writer_instructions = """Your goal is to generate sophisticated and diverse web search queries. These queries are intended for an advanced automated web research tool capable of analyzing complex results, following links, and synthesizing information.
 
 Instructions:
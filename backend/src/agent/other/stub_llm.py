@@ -0,0 +1,230 @@
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+STUB_STRATEGY_CODE = '''import backtrader as bt
+import pandas as pd
+import numpy as np
+import math
+import datetime
+
+
+class MyStrategy(bt.Strategy):
+    """
+    Moving average crossover, long only.
+    """
+
+    params = dict(
+        fast_period=20,
+        slow_period=50,
+        target=0.95,
+    )
+
+    def __init__(self):
+        """
+        Called once at the start of the strategy.
+        Should not have any input parameters.
+        """
+        self.fast = bt.ind.SMA(period=self.p.fast_period)
+        self.slow = bt.ind.SMA(period=self.p.slow_period)
+
+    def next(self):
+        """
+        Called on each new data point (bar).
+        """
+        if not self.position and self.fast[0] > self.slow[0]:
+            self.order_target_percent(target=self.p.target)
+        elif self.position and self.fast[0] <= self.slow[0]:
+            self.order_target_percent(target=0.0)
+
+    @staticmethod
+    def signals(data, params):
+        fast = data["close"].rolling(params["fast_period"]).mean()
+        slow = data["close"].rolling(params["slow_period"]).mean()
+        return np.where(fast > slow, params["target"], 0.0)
+'''
+
+
+# Share of a reply's latency spent before the first token, without caching
+PREFILL_SHARE = 0.3
+
+
+class _StubStream:
+    """Context manager shaped like the SDK's `MessageStream`."""
+
+    def __init__(self, text, usage, first_token_delay, remaining_delay):
+        self._text = text
+        self._usage = usage
+        self._first_token_delay = first_token_delay
+        self._remaining_delay = remaining_delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        time.sleep(self._first_token_delay)
+        chunks = [self._text[i : i + 200] for i in range(0, len(self._text), 200)]
+        for chunk in chunks:
+            yield chunk
+            time.sleep(self._remaining_delay / len(chunks))
+
+    def get_final_message(self):
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=self._text)],
+            usage=self._usage,
+        )
+
+
+class _StubMessages:
+    def __init__(self, client):
+        self._client = client
+
+    def _respond(self, messages):
+        """Reply text, usage and the time it takes to generate."""
+        client = self._client
+        prompt = messages[-1]["content"]
+        if isinstance(prompt, str):
+            blocks = [{"type": "text", "text": prompt}]
+        else:
+            blocks = prompt
+
+        # Blocks up to the last cache marker are read from the cache once
+        # another call has written the same prefix
+        cached = [i for i, block in enumerate(blocks) if block.get("cache_control")]
+        prefix = (
+            "".join(block["text"] for block in blocks[: cached[-1] + 1])
+            if cached
+            else ""
+        )
+        text = "".join(block["text"] for block in blocks)
+        with client.lock:
+            client.calls += 1
+            hit = prefix in client.cache
+            if prefix:
+                client.cache.add(prefix)
+
+        reply = client.reply(text)
+        usage = SimpleNamespace(
+            input_tokens=(len(text) - len(prefix)) // 4,
+            cache_creation_input_tokens=0 if hit else len(prefix) // 4,
+            cache_read_input_tokens=len(prefix) // 4 if hit else 0,
+            output_tokens=len(reply) // 4,
+        )
+        # Simulated network + generation time, with a little spread
+        latency = client.latency * random.uniform(0.8, 1.2)
+        return reply, usage, latency, (len(prefix) if hit else 0) / max(1, len(text))
+
+    def create(self, model, max_tokens, messages, **kwargs):
+        reply, usage, latency, _ = self._respond(messages)
+        time.sleep(latency)
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=reply)], usage=usage
+        )
+
+    def stream(self, model, max_tokens, messages, **kwargs):
+        reply, usage, latency, cached_share = self._respond(messages)
+        # Reading the prompt takes PREFILL_SHARE of the time, less the part
+        # of it served from the cache
+        first_token_delay = latency * PREFILL_SHARE * (1 - cached_share)
+        return _StubStream(
+            reply, usage, first_token_delay, latency * (1 - PREFILL_SHARE)
+        )
+
+
+class StubAnthropic:
+    """Offline stand-in for `anthropic.Anthropic` with canned replies.
+
+    Recognizes the prompts sent by the think and implement nodes and answers
+    in the format each expects, after sleeping `latency` seconds. Prompt
+    prefixes marked with `cache_control` are remembered, and calls that
+    repeat one report cache reads and stream their first token sooner.
+    """
+
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.cache = set()
+        self.messages = _StubMessages(self)
+
+    def reply(self, prompt: str) -> str:
+        if '"strategies"' in prompt:
+            strategies = [
+                f"# Strategy {index}: Moving average crossover variant {index}"
+                for index in range(1, 5)
+            ]
+            return json.dumps({"strategies": strategies})
+        if '"improvement"' in prompt:
+            return json.dumps(
+                {
+                    "description": "Moving average crossover with a trend filter.",
+                    "improvement": "Only trade when the slow average is rising.",
+                }
+            )
+        if "<<<<<<< SEARCH" in prompt:
+            # Applies to STUB_STRATEGY_CODE; other previous code exercises
+            # the fallback to a full file
+            return (
+                "<<<<<<< SEARCH\n        slow_period=50,\n=======\n"
+                "        slow_period=60,\n>>>>>>> REPLACE\n"
+            )
+        return f"```python\n{STUB_STRATEGY_CODE}```"
+
+
+if __name__ == "__main__":
+    # Offline benchmark of the think node's refinement fan-out:
+    # python -m src.agent.other.stub_llm
+    import tempfile
+
+    from src.agent.nodes.artifacts import get_artifact_store, summarize_result
+    from src.agent.nodes.resources import register
+    from src.agent.nodes.think import think
+
+    # Previous code and results are read from the artifact store, as in a run
+    artifact_dir = tempfile.mkdtemp()
+    artifacts = get_artifact_store(artifact_dir)
+    pre_result = {"final_value": 100000, "sharpe": {"sharperatio": 0.5}}
+    pre_code_id = artifacts.put_text(STUB_STRATEGY_CODE)
+    pre_result_id = artifacts.put_json(pre_result)
+
+    population = 8
+    for concurrency in (1, 4, 8):
+        client = StubAnthropic(latency=0.5)
+        register(f"stub-{concurrency}", client=client)
+        state = {
+            "run_id": f"stub-{concurrency}",
+            "stock_symbol": "QQQ",
+            "think_count": 1,
+            "solutions": [
+                [
+                    {
+                        "solution_id": f"1_{index + 1}",
+                        "pre_description": "Moving average crossover",
+                        "pre_code_id": pre_code_id,
+                        "pre_result_id": pre_result_id,
+                        "pre_result": summarize_result(pre_result),
+                    }
+                    for index in range(population)
+                ]
+            ],
+        }
+        config = {
+            "configurable": {
+                "llm_concurrency": concurrency,
+                "artifact_dir": artifact_dir,
+            }
+        }
+        started = time.perf_counter()
+        result = think(state, config)
+        elapsed = time.perf_counter() - started
+        ids = [s["solution_id"] for s in result["solutions"][-1]]
+        print(
+            f"concurrency={concurrency}: {elapsed:.2f}s for {client.calls} calls, "
+            f"order={ids}"
+        )